@@ -8,21 +8,24 @@ This agent handles the complete upload verification workflow:
 - Token distribution (Blockchain Skill)
 """
 
-import json
 import logging
 from typing import Optional
 
 from skills.vision.skill import analyze_image
-from skills.anti_fraud.skill import check_fraud
+from skills.anti_fraud.skill import submit_checked
 from skills.database.skill import (
-    save_facility,
-    update_facility,
     save_reward,
+    queue_reward_record,
     query_facilities_nearby,
     get_user_rewards as db_get_user_rewards,
     get_facility_by_id
 )
-from skills.blockchain.skill import send_reward, generate_location_hash, distribute_reward_with_hash
+from skills.blockchain.skill import (
+    send_reward,
+    generate_location_hash,
+    distribute_reward_with_hash,
+    TransactionMaybeSent
+)
 
 logger = logging.getLogger(__name__)
 
@@ -82,9 +85,20 @@ class Help2EarnAgent:
 
             logger.info(f"Image analysis: type={facility_type}, condition={condition}")
 
-            # Step 2: Check for fraud/duplicates
-            logger.info("Step 2: Checking for duplicates...")
-            fraud_result = await check_fraud(lat, lng, facility_type)
+            # Steps 2-3: Check for fraud/duplicates and submission rate, and
+            # save the facility if the submission passes
+            logger.info("Step 2: Checking for duplicates and saving...")
+            submission_check = await submit_checked(
+                lat, lng, facility_type, wallet, image_url or "pending", vision_result
+            )
+            fraud_result = submission_check["fraud"]
+            rate_result = submission_check["rate"]
+
+            if not rate_result.get("allowed", True):
+                return {
+                    "success": False,
+                    "reason": f"Rate limited: {rate_result.get('reason')}"
+                }
 
             if fraud_result.get("is_fraud"):
                 return {
@@ -94,29 +108,9 @@ class Help2EarnAgent:
 
             reward_amount = fraud_result.get("reward_amount", 50)
             existing_facility_id = fraud_result.get("existing_facility_id")
+            facility_id = submission_check["facility_id"]
 
             logger.info(f"Fraud check passed: reward={reward_amount}, existing={existing_facility_id}")
-
-            # Step 3: Save to database
-            logger.info("Step 3: Saving to database...")
-            if existing_facility_id:
-                # Update existing facility
-                await update_facility(existing_facility_id, {
-                    "image_url": image_url or "pending",
-                    "ai_analysis": json.dumps(vision_result)
-                })
-                facility_id = existing_facility_id
-            else:
-                # Create new facility
-                facility_id = await save_facility({
-                    "type": facility_type,
-                    "latitude": lat,
-                    "longitude": lng,
-                    "image_url": image_url or "pending",
-                    "ai_analysis": json.dumps(vision_result),
-                    "contributor_address": wallet
-                })
-
             logger.info(f"Facility saved: {facility_id}")
 
             # Step 4: Send reward via RewardDistributor
@@ -129,6 +123,10 @@ class Help2EarnAgent:
                 logger.info(f"Location hash: {location_hash.hex()}")
                 tx_hash = await distribute_reward_with_hash(wallet, location_hash, reward_amount)
                 logger.info(f"Reward sent via distributor: {reward_amount} tokens, tx={tx_hash}")
+            except TransactionMaybeSent as e:
+                # May have been sent and mined; a direct mint could double-reward
+                blockchain_error = f"Distributor transaction pending: {str(e)}"
+                logger.warning(blockchain_error)
             except Exception as e:
                 blockchain_error = f"Distributor failed: {str(e)}"
                 logger.error(blockchain_error)
@@ -141,13 +139,16 @@ class Help2EarnAgent:
                     blockchain_error = f"Both methods failed. Distributor: {str(e)}, Direct mint: {str(e2)}"
                     logger.error(blockchain_error)
 
-            # Save reward record
-            await save_reward({
+            # Save reward record in the background (synchronously if the
+            # queue is full); the response doesn't depend on it
+            reward_record = {
                 "wallet_address": wallet,
                 "facility_id": facility_id,
                 "amount": reward_amount,
                 "tx_hash": tx_hash
-            })
+            }
+            if not queue_reward_record(reward_record):
+                await save_reward(reward_record)
 
             return {
                 "success": True,
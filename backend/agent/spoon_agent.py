@@ -7,12 +7,11 @@ by orchestrating tools through an LLM-driven decision loop.
 Uses Gemini as the LLM provider via ChatBot.
 """
 
-import base64
-import json
 import logging
 import os
 from typing import Optional
 
+import orjson
 from spoon_ai import ChatBot
 from spoon_ai.agents import SpoonReactAI
 from spoon_ai.tools import ToolManager
@@ -74,10 +73,10 @@ class Help2EarnReactAgent(SpoonReactAI):
                     'image_url': ctx.get('image_url') or '',  # Handle None explicitly
                     'contributor_address': ctx.get('wallet'),  # Note: parameter is contributor_address not wallet_address
                     # Save both condition and details
-                    'ai_analysis': json.dumps({
+                    'ai_analysis': orjson.dumps({
                         'condition': vision_result.get('condition'),
                         'details': vision_result.get('details', {})
-                    })
+                    }).decode()
                 }
             }
 
@@ -209,14 +208,14 @@ class Help2EarnReactAgent(SpoonReactAI):
         db_result = self._tool_results.get('database_save_facility', {})
         blockchain_result = self._tool_results.get('blockchain_reward', {})
 
-        return json.dumps({
+        return orjson.dumps({
             "success": True,
             "facility_id": db_result.get('facility_id'),
             "facility_type": vision_result.get('facility_type'),
             "condition": vision_result.get('condition'),
             "reward_amount": fraud_result.get('reward_amount', 50),
             "tx_hash": blockchain_result.get('tx_hash')
-        })
+        }).decode()
 
     async def execute_tool(self, tool_call) -> str:
         """Override to track tool results."""
@@ -239,7 +238,7 @@ class Help2EarnReactAgent(SpoonReactAI):
             try:
                 # Result might be a string representation of dict
                 if isinstance(result, str) and result.startswith('{'):
-                    self._tool_results[tool_name] = json.loads(result)
+                    self._tool_results[tool_name] = orjson.loads(result)
                 elif isinstance(result, str) and 'Observed output' in result:
                     # Extract dict from SpoonOS format "Observed output of cmd xxx execution: {...}"
                     import re
@@ -248,7 +247,7 @@ class Help2EarnReactAgent(SpoonReactAI):
                         try:
                             self._tool_results[tool_name] = eval(match.group())
                         except:
-                            self._tool_results[tool_name] = json.loads(match.group())
+                            self._tool_results[tool_name] = orjson.loads(match.group())
             except Exception as e:
                 logger.warning(f"Could not parse tool result for {tool_name}: {e}")
 
@@ -271,9 +270,11 @@ from tools.anti_fraud_tool import (
     AntiFraudCheckTool,
     AntiFraudRateCheckTool,
     AntiFraudLocationCheckTool,
+    AntiFraudCombinedCheckTool,
 )
 from tools.database_tool import (
     DatabaseSaveFacilityTool,
+    DatabaseSaveFacilitiesBulkTool,
     DatabaseUpdateFacilityTool,
     DatabaseSaveRewardTool,
     DatabaseQueryFacilitiesTool,
@@ -283,9 +284,11 @@ from tools.database_tool import (
 )
 from tools.blockchain_tool import (
     BlockchainRewardTool,
+    BlockchainBatchRewardTool,
     BlockchainBalanceTool,
     BlockchainCheckVerificationTool,
 )
+from tools.pipeline_tool import ContributionPipelineTool
 
 logger = logging.getLogger(__name__)
 
@@ -352,8 +355,10 @@ class Help2EarnSpoonAgent:
             AntiFraudCheckTool(),
             AntiFraudRateCheckTool(),
             AntiFraudLocationCheckTool(),
+            AntiFraudCombinedCheckTool(),
             # Database tools
             DatabaseSaveFacilityTool(),
+            DatabaseSaveFacilitiesBulkTool(),
             DatabaseUpdateFacilityTool(),
             DatabaseSaveRewardTool(),
             DatabaseQueryFacilitiesTool(),
@@ -362,8 +367,11 @@ class Help2EarnSpoonAgent:
             DatabaseCheckExistingTool(),
             # Blockchain tools
             BlockchainRewardTool(),
+            BlockchainBatchRewardTool(),
             BlockchainBalanceTool(),
             BlockchainCheckVerificationTool(),
+            # Pipeline tools
+            ContributionPipelineTool(),
         ]
 
         # Create ToolManager with tool instances
@@ -422,9 +430,7 @@ Call the next tool NOW with the appropriate parameters.
         try:
             # Store image in context for tools to access directly
             # This avoids passing large base64 data through the LLM which causes truncation
-            image_base64 = base64.b64encode(image).decode('utf-8')
             _current_upload_context = {
-                "image_base64": image_base64,
                 "image_bytes": image,
                 "lat": lat,
                 "lng": lng,
@@ -515,13 +521,13 @@ START NOW with step 1.
             if isinstance(result, str):
                 try:
                     # Try to parse as JSON first
-                    parsed = json.loads(result)
+                    parsed = orjson.loads(result)
                     if isinstance(parsed, dict):
                         # Ensure success field is set
                         if "success" not in parsed:
                             parsed["success"] = True
                         return parsed
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     # Not valid JSON, treat as text response
                     pass
                 
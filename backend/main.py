@@ -14,7 +14,7 @@ from typing import Optional, Union
 
 from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -37,6 +37,7 @@ from models.schemas import (
 )
 from skills.database.skill import DatabasePool
 from skills.storage.skill import upload_image
+from skills.vision.skill import normalize_image, start_image_analysis
 from fastapi.staticfiles import StaticFiles
 
 # Configure logging
@@ -64,6 +65,13 @@ async def lifespan(app: FastAPI):
     else:
         logger.info("Original Help2EarnAgent initialized (USE_SPOON_AGENT=false)")
 
+    # Open the pool now so the first request doesn't pay the connection handshake
+    try:
+        await DatabasePool.get_pool()
+        logger.info("Database pool warmed")
+    except Exception as e:
+        logger.error(f"Database pool warm-up failed: {e}")
+
     yield
 
     # Shutdown
@@ -77,7 +85,9 @@ app = FastAPI(
     title="Help2Earn API",
     description="DePIN-based accessibility facility data collection platform",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson renders responses (datetimes included) in C
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -146,7 +156,12 @@ async def upload_facility(
         raise HTTPException(status_code=503, detail="Agent not initialized")
 
     try:
-        # Read image data
+        # Reject oversized uploads from the multipart size, before reading
+        # the spooled file into memory
+        if image.size is not None and image.size > 10 * 1024 * 1024:
+            raise HTTPException(status_code=400, detail="Image too large (max 10MB)")
+
+        # Read image data (normalization and analysis need the bytes)
         image_data = await image.read()
 
         # Validate image size (max 10MB)
@@ -166,6 +181,13 @@ async def upload_facility(
             f"wallet={wallet_address[:10]}..., size={len(image_data)}"
         )
 
+        # Shrink oversized photos once; storage and analysis both use the result
+        image_data, content_type = await normalize_image(image_data, content_type)
+
+        # Start the Gemini call now so it overlaps the storage upload; the
+        # agent's vision step joins it rather than sending a second request
+        start_image_analysis(image_data)
+
         # Upload image to Google Cloud Storage first
         storage_result = await upload_image(
             image_data=image_data,
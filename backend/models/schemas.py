@@ -3,7 +3,7 @@ Pydantic models for API request/response schemas.
 """
 
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Union
 from pydantic import BaseModel, Field
 
 
@@ -27,7 +27,7 @@ class FacilityResponse(FacilityBase):
     """Response model for a facility."""
     id: str
     image_url: str
-    ai_analysis: Optional[str] = None
+    ai_analysis: Optional[Union[Dict[str, Any], str]] = None
     contributor_address: str
     distance: Optional[float] = Field(None, description="Distance from query point in meters")
     created_at: datetime
@@ -2,6 +2,8 @@
 from .skill import (
     check_fraud,
     check_user_submission_rate,
+    check_submission,
+    submit_checked,
     check_location_validity,
     get_fraud_statistics
 )
@@ -9,6 +11,8 @@ from .skill import (
 __all__ = [
     "check_fraud",
     "check_user_submission_rate",
+    "check_submission",
+    "submit_checked",
     "check_location_validity",
     "get_fraud_statistics"
 ]
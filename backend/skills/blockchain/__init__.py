@@ -1,16 +1,28 @@
 """Blockchain Skill - Ethereum token distribution."""
 from .skill import (
     send_reward,
+    send_rewards_bulk,
+    queue_reward,
     distribute_reward_with_hash,
+    distribute_rewards_batch,
+    queue_distribute_reward,
     get_balance,
     check_verification,
-    generate_location_hash
+    generate_location_hash,
+    generate_location_hashes,
+    TransactionMaybeSent
 )
 
 __all__ = [
     "send_reward",
+    "send_rewards_bulk",
+    "queue_reward",
     "distribute_reward_with_hash",
+    "distribute_rewards_batch",
+    "queue_distribute_reward",
     "get_balance",
     "check_verification",
-    "generate_location_hash"
+    "generate_location_hash",
+    "generate_location_hashes",
+    "TransactionMaybeSent"
 ]
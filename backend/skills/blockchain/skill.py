@@ -8,12 +8,36 @@ Handles all blockchain operations including:
 """
 
 import os
+import time
+import random
+import asyncio
+import hashlib
 import logging
-from typing import Optional
-
-from web3 import Web3
+import functools
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import requests
+from eth_abi import decode as abi_decode, encode as abi_encode
+from eth_utils import function_signature_to_4byte_selector
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from web3 import AsyncWeb3, Web3, WebSocketProvider
+from web3.contract import Contract
+from web3.exceptions import (
+    BadResponseFormat,
+    MethodUnavailable,
+    TimeExhausted,
+    TransactionNotFound
+)
 from eth_account import Account
 
+try:
+    # Bind the C-backed keccak directly instead of going through eth_hash.auto
+    from eth_hash.backends.pycryptodome import keccak256 as keccak
+except ImportError:
+    from eth_hash.auto import keccak
+
 logger = logging.getLogger(__name__)
 
 # Configuration from environment
@@ -21,10 +45,58 @@ SEPOLIA_RPC_URL = os.getenv(
     "SEPOLIA_RPC_URL",
     "https://sepolia.infura.io/v3/YOUR_INFURA_KEY"
 )
+# Optional WebSocket endpoint used to wait for inclusion via newHeads
+SEPOLIA_WS_URL = os.getenv("SEPOLIA_WS_URL", "")
 PRIVATE_KEY = os.getenv("MINTER_PRIVATE_KEY", "")
 TOKEN_CONTRACT_ADDRESS = os.getenv("TOKEN_CONTRACT_ADDRESS", "")
 DISTRIBUTOR_CONTRACT_ADDRESS = os.getenv("DISTRIBUTOR_CONTRACT_ADDRESS", "")
 MOCK_BLOCKCHAIN = os.getenv("MOCK_BLOCKCHAIN", "false").lower() == "true"
+RPC_TIMEOUT_SECONDS = 30
+SEPOLIA_CHAIN_ID = 11155111
+# Optional override; otherwise eth_chainId is queried once per client
+CHAIN_ID = int(os.getenv("CHAIN_ID", "0"))
+
+# Gas price barely moves between adjacent sends; bursts share one lookup
+GAS_PRICE_TTL_SECONDS = 5
+
+# distributeReward gas = eth_estimateGas * margin
+GAS_ESTIMATE_MARGIN = 1.2
+
+# Average block time of the target chain (Sepolia: 12s)
+CHAIN_BLOCK_TIME_SECONDS = float(os.getenv("CHAIN_BLOCK_TIME_SECONDS", "12"))
+
+# Receipt polling: start short, back off towards the block time
+RECEIPT_TIMEOUT_SECONDS = 10 * CHAIN_BLOCK_TIME_SECONDS
+RECEIPT_POLL_START_SECONDS = 0.25
+RECEIPT_POLL_MAX_SECONDS = CHAIN_BLOCK_TIME_SECONDS
+RECEIPT_POLL_BACKOFF = 1.6
+
+# Read-only RPCs (preflight reads, gas estimation) are retried on
+# connection errors and timeouts with jittered exponential backoff
+RPC_RETRY_ATTEMPTS = 3
+RPC_RETRY_BASE_SECONDS = 0.25
+
+# check_verification result cache
+VERIFICATION_CACHE_TTL_SECONDS = 30
+VERIFICATION_CACHE_MAX_SIZE = 4096
+
+# get_balance result cache
+BALANCE_CACHE_TTL_SECONDS = 5
+BALANCE_CACHE_MAX_SIZE = 4096
+
+# Reward batching (queue_reward -> batchMint)
+REWARD_BATCH_MAX_SIZE = 50
+REWARD_BATCH_WINDOW_SECONDS = 0.5
+
+# Claim batching (queue_distribute_reward -> distributeRewardBatch)
+CLAIM_BATCH_MAX_SIZE = 50
+CLAIM_BATCH_WINDOW_SECONDS = 0.2
+
+# Multicall3 is deployed at the same address on Sepolia and most EVM chains
+MULTICALL3_ADDRESS = os.getenv(
+    "MULTICALL3_ADDRESS",
+    "0xcA11bde05977b3631167028862bE2a173976CA11"
+)
 
 # ERC-20 Token ABI (minimal for minting)
 TOKEN_ABI = [
@@ -38,6 +110,16 @@ TOKEN_ABI = [
         "stateMutability": "nonpayable",
         "type": "function"
     },
+    {
+        "inputs": [
+            {"name": "to", "type": "address[]"},
+            {"name": "amounts", "type": "uint256[]"}
+        ],
+        "name": "batchMint",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function"
+    },
     {
         "inputs": [{"name": "account", "type": "address"}],
         "name": "balanceOf",
@@ -67,6 +149,17 @@ DISTRIBUTOR_ABI = [
         "stateMutability": "nonpayable",
         "type": "function"
     },
+    {
+        "inputs": [
+            {"name": "users", "type": "address[]"},
+            {"name": "locationHashes", "type": "bytes32[]"},
+            {"name": "amounts", "type": "uint256[]"}
+        ],
+        "name": "distributeRewardBatch",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function"
+    },
     {
         "inputs": [{"name": "", "type": "bytes32"}],
         "name": "verificationRecords",
@@ -76,6 +169,77 @@ DISTRIBUTOR_ABI = [
     }
 ]
 
+# Multicall3 ABI (read aggregation only)
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate",
+        "outputs": [
+            {"name": "blockNumber", "type": "uint256"},
+            {"name": "returnData", "type": "bytes[]"}
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    }
+]
+
+
+# Selectors of the state-changing calls; their calldata is encoded directly
+# with eth_abi instead of going through web3's ABI function dispatch
+MINT_SELECTOR = function_signature_to_4byte_selector("mint(address,uint256)")
+BATCH_MINT_SELECTOR = function_signature_to_4byte_selector("batchMint(address[],uint256[])")
+DISTRIBUTE_REWARD_SELECTOR = function_signature_to_4byte_selector(
+    "distributeReward(address,bytes32,uint256)"
+)
+DISTRIBUTE_REWARD_BATCH_SELECTOR = function_signature_to_4byte_selector(
+    "distributeRewardBatch(address[],bytes32[],uint256[])"
+)
+
+
+@functools.lru_cache(maxsize=8192)
+def _checksum(address: str) -> str:
+    """Checksum an address, memoized since the same wallets recur."""
+    return Web3.to_checksum_address(address)
+
+
+def _view_functions(abi: list) -> list:
+    """ABI entries for read-only functions."""
+    return [entry for entry in abi if entry.get("stateMutability") == "view"]
+
+
+# ABIs the web3 contract objects are built from. Writes (mint, batchMint,
+# distributeReward) are encoded through the selectors above, so only the
+# view functions need ContractFunction proxies.
+ABIS = {
+    "token": _view_functions(TOKEN_ABI),
+    "distributor": _view_functions(DISTRIBUTOR_ABI),
+    "multicall": MULTICALL3_ABI
+}
+
+# Built contract objects keyed by (checksum address, ABI name). web3 parses
+# the ABI and builds a ContractFunction class per function for every
+# contract object, so rebuilt clients share the first instance instead.
+_contracts: Dict[Tuple[str, str], Contract] = {}
+
+
+def _get_contract(w3: Web3, address: str, abi_name: str) -> Contract:
+    """Get the shared contract object for an address and ABI."""
+    key = (_checksum(address), abi_name)
+    contract = _contracts.get(key)
+    if contract is None:
+        contract = w3.eth.contract(address=key[0], abi=ABIS[abi_name])
+        _contracts[key] = contract
+    return contract
+
 
 class MockContractFunction:
     def __init__(self, name):
@@ -94,6 +258,8 @@ class MockContractFunction:
         return {"to": "0x00", "data": "0x"}
 
 class MockContract:
+    address = "0x0000000000000000000000000000000000000000"
+
     def __init__(self, functions):
         self.functions = functions
 
@@ -109,14 +275,18 @@ class MockWeb3:
         gas_price = 1000000000
         
         @staticmethod
-        def get_transaction_count(address):
+        def get_transaction_count(address, block_identifier="latest"):
             return 0
+
+        @staticmethod
+        def estimate_gas(tx):
+            return 100000
             
         class account:
             address = "0x0000000000000000000000000000000000000000"
             
             @staticmethod
-            def sign_transaction(tx, private_key):
+            def sign_transaction(tx, private_key=None):
                 class SignedTx:
                     raw_transaction = b"mock"
                 return SignedTx()
@@ -131,19 +301,59 @@ class MockWeb3:
                 status = 1
             return Receipt()
 
+        @staticmethod
+        def get_transaction_receipt(tx_hash):
+            return MockWeb3.eth.wait_for_transaction_receipt(tx_hash)
+
+
+def _build_rpc_session() -> requests.Session:
+    """
+    Build a keep-alive HTTP session for the JSON-RPC provider.
+
+    Retries only cover failed connects and responses where the provider
+    did not process the request (429/503). Read timeouts and dropped
+    connections are not retried: the request may already have been
+    processed, and resending an eth_sendRawTransaction would fail as
+    "already known" / "nonce too low".
+    """
+    retry = Retry(
+        total=3,
+        read=0,
+        other=0,
+        backoff_factor=0.2,
+        status_forcelist=[429, 503],
+        allowed_methods=["POST"]
+    )
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retry))
+    session.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retry))
+    return session
+
 
 class BlockchainClient:
     """Web3 client for blockchain operations."""
 
     def __init__(self):
+        self._decimals: Optional[int] = None
+        self._chain_id: Optional[int] = CHAIN_ID or None
+        self._nonce: Optional[int] = None
+        self._nonce_lock = asyncio.Lock()
+        self._gas_price: Optional[Tuple[int, float]] = None
+
         if MOCK_BLOCKCHAIN:
+            self._decimals = 18
+            self._chain_id = self._chain_id or SEPOLIA_CHAIN_ID
             self.w3 = MockWeb3()
             self.account = MockWeb3.eth.account
             self.token = MockContract(MockFunctions())
             self.distributor = MockContract(MockFunctions())
             return
 
-        self.w3 = Web3(Web3.HTTPProvider(SEPOLIA_RPC_URL))
+        self.w3 = Web3(Web3.HTTPProvider(
+            SEPOLIA_RPC_URL,
+            session=_build_rpc_session(),
+            request_kwargs={"timeout": RPC_TIMEOUT_SECONDS}
+        ))
 
         if PRIVATE_KEY:
             self.account = Account.from_key(PRIVATE_KEY)
@@ -152,21 +362,113 @@ class BlockchainClient:
             logger.warning("No private key configured - blockchain operations will fail")
 
         if TOKEN_CONTRACT_ADDRESS:
-            self.token = self.w3.eth.contract(
-                address=Web3.to_checksum_address(TOKEN_CONTRACT_ADDRESS),
-                abi=TOKEN_ABI
-            )
+            self.token = _get_contract(self.w3, TOKEN_CONTRACT_ADDRESS, "token")
         else:
             self.token = None
 
         if DISTRIBUTOR_CONTRACT_ADDRESS:
-            self.distributor = self.w3.eth.contract(
-                address=Web3.to_checksum_address(DISTRIBUTOR_CONTRACT_ADDRESS),
-                abi=DISTRIBUTOR_ABI
-            )
+            self.distributor = _get_contract(self.w3, DISTRIBUTOR_CONTRACT_ADDRESS, "distributor")
         else:
             self.distributor = None
 
+        self.multicall = _get_contract(self.w3, MULTICALL3_ADDRESS, "multicall")
+
+    def decimals(self) -> int:
+        """Token decimals, fetched once (ERC-20 decimals never change)."""
+        if self._decimals is None:
+            self._decimals = self.token.functions.decimals().call()
+        return self._decimals
+
+    def chain_id(self) -> int:
+        """Chain id, from CHAIN_ID or fetched once from the node."""
+        if self._chain_id is None:
+            self._chain_id = self.w3.eth.chain_id
+        return self._chain_id
+
+    async def reserve_nonce(self) -> int:
+        """
+        Hand out the next nonce for the minter account.
+
+        The counter is loaded from the pending transaction count once and then
+        incremented locally, so concurrent sends never share a nonce.
+        """
+        async with self._nonce_lock:
+            if self._nonce is None:
+                self._nonce = await asyncio.to_thread(
+                    self.w3.eth.get_transaction_count, self.account.address, "pending"
+                )
+            nonce = self._nonce
+            self._nonce += 1
+            return nonce
+
+    def reset_nonce(self) -> None:
+        """Forget the local nonce so the next send resyncs from the chain."""
+        self._nonce = None
+
+    def gas_price(self) -> int:
+        """Current gas price, cached for GAS_PRICE_TTL_SECONDS."""
+        cached = self._gas_price
+        if cached is not None and time.monotonic() - cached[1] < GAS_PRICE_TTL_SECONDS:
+            return cached[0]
+        price = self.w3.eth.gas_price
+        self._gas_price = (price, time.monotonic())
+        return price
+
+    def balance_with_decimals(self, address: str) -> Tuple[int, int]:
+        """
+        Fetch a token balance (in wei) together with the token decimals.
+
+        Uses the cached decimals when available; otherwise both eth_calls
+        travel in one JSON-RPC batch, falling back to sequential calls for
+        providers that reject batches.
+        """
+        if self._decimals is not None:
+            return self.token.functions.balanceOf(address).call(), self._decimals
+
+        try:
+            with self.w3.batch_requests() as batch:
+                batch.add(self.token.functions.balanceOf(address))
+                batch.add(self.token.functions.decimals())
+                balance_wei, decimals = batch.execute()
+            self._decimals = decimals
+            return balance_wei, decimals
+        except (BadResponseFormat, MethodUnavailable) as e:
+            logger.warning(f"JSON-RPC batch unavailable, using sequential calls: {e}")
+            return self.token.functions.balanceOf(address).call(), self.decimals()
+
+    def verification_with_decimals(self, location_hash: bytes) -> Tuple[bool, int]:
+        """
+        Read a location's verification flag together with the token decimals.
+
+        Uses the cached decimals when available; otherwise both reads are
+        aggregated into a single Multicall3 eth_call.
+        """
+        if self._decimals is not None:
+            is_verified = self.distributor.functions.verificationRecords(location_hash).call()
+            return is_verified, self._decimals
+
+        try:
+            calls = [
+                (
+                    self.distributor.address,
+                    Web3.to_bytes(hexstr=self.distributor.encode_abi(
+                        "verificationRecords", args=[location_hash]
+                    ))
+                ),
+                (
+                    self.token.address,
+                    Web3.to_bytes(hexstr=self.token.encode_abi("decimals"))
+                )
+            ]
+            _, return_data = self.multicall.functions.aggregate(calls).call()
+            is_verified = abi_decode(["bool"], return_data[0])[0]
+            self._decimals = abi_decode(["uint8"], return_data[1])[0]
+            return is_verified, self._decimals
+        except Exception as e:
+            logger.warning(f"Multicall failed, using sequential calls: {e}")
+            is_verified = self.distributor.functions.verificationRecords(location_hash).call()
+            return is_verified, self.decimals()
+
     def is_configured(self) -> bool:
         """Check if blockchain client is properly configured."""
         if MOCK_BLOCKCHAIN:
@@ -191,6 +493,220 @@ def get_client() -> BlockchainClient:
     return _client
 
 
+# location_hash -> (is_verified, cached_at), least recently used first
+_verification_cache: "OrderedDict[bytes, Tuple[bool, float]]" = OrderedDict()
+
+
+def _cache_verification(location_hash: bytes, is_verified: bool) -> None:
+    """Store a verification flag, evicting the least recently used entries."""
+    _verification_cache[location_hash] = (is_verified, time.monotonic())
+    _verification_cache.move_to_end(location_hash)
+    while len(_verification_cache) > VERIFICATION_CACHE_MAX_SIZE:
+        _verification_cache.popitem(last=False)
+
+
+# checksum address -> (balance, cached_at), least recently used first
+_balance_cache: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+# Balance reads in flight, keyed by checksum address
+_inflight_balances: Dict[str, asyncio.Task] = {}
+
+
+def _cache_balance(address: str, balance: int) -> None:
+    """Store a balance, evicting the least recently used entries."""
+    _balance_cache[address] = (balance, time.monotonic())
+    _balance_cache.move_to_end(address)
+    while len(_balance_cache) > BALANCE_CACHE_MAX_SIZE:
+        _balance_cache.popitem(last=False)
+
+
+class TransactionMaybeSent(TimeExhausted):
+    """
+    A transaction was (or may have been) broadcast but its outcome is unknown.
+
+    Raised for any failure after the nonce was used: a send whose response
+    was lost, a receipt that could not be fetched or was not mined in time.
+    Callers must not fall back to another payout, which could pay twice.
+    """
+
+
+def _sign_and_send(
+    client: BlockchainClient,
+    to: str,
+    data: bytes,
+    gas: int,
+    nonce: int,
+    gas_price: int,
+    chain_id: int
+) -> bytes:
+    """Sign and broadcast a contract transaction with pre-encoded calldata (blocking)."""
+    tx = {
+        'to': to,
+        'from': client.account.address,
+        'nonce': nonce,
+        'gas': gas,
+        'gasPrice': gas_price,
+        'chainId': chain_id,
+        'value': 0,
+        'data': data
+    }
+    # The LocalAccount keeps the parsed key; no per-tx key derivation
+    signed_tx = client.account.sign_transaction(tx)
+    return client.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+
+
+async def _rpc_with_retry(func, *args):
+    """
+    Run a blocking read-only RPC in a thread, retrying transient failures.
+
+    Only connection errors and timeouts are retried; anything else (e.g. a
+    revert during gas estimation) is raised at once. Never use this for
+    broadcasts, where a retry could send a transaction twice.
+    """
+    for attempt in range(RPC_RETRY_ATTEMPTS):
+        try:
+            return await asyncio.to_thread(func, *args)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt == RPC_RETRY_ATTEMPTS - 1:
+                raise
+            delay = RPC_RETRY_BASE_SECONDS * 2 ** attempt + random.random() * 0.1
+            logger.warning(f"RPC {func.__name__} failed ({e}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+
+def _estimate_gas(client: BlockchainClient, to: str, data: bytes) -> int:
+    """
+    Estimate gas for a contract call plus a safety margin (blocking).
+
+    A call that would revert raises here, before a nonce is spent on it.
+    """
+    estimate = client.w3.eth.estimate_gas({
+        'from': client.account.address,
+        'to': to,
+        'data': data
+    })
+    return int(estimate * GAS_ESTIMATE_MARGIN)
+
+
+async def _broadcast(client: BlockchainClient, to: str, data: bytes, gas: int) -> bytes:
+    """
+    Reserve a nonce and broadcast a contract transaction.
+
+    Raises TransactionMaybeSent if the node may have received the
+    transaction before the request failed.
+    """
+    # Reads go first so their failures can't be mistaken for a lost send
+    gas_price = await _rpc_with_retry(client.gas_price)
+    chain_id = await _rpc_with_retry(client.chain_id)
+    nonce = await client.reserve_nonce()
+    try:
+        return await asyncio.to_thread(
+            _sign_and_send, client, to, data, gas, nonce, gas_price, chain_id
+        )
+    except requests.ConnectTimeout:
+        # Never connected, so nothing was sent
+        client.reset_nonce()
+        raise
+    except (requests.ConnectionError, requests.Timeout) as e:
+        # The request may have reached the node before the response was lost
+        client.reset_nonce()
+        raise TransactionMaybeSent(f"Broadcast outcome unknown: {e}") from e
+    except Exception:
+        # The reserved nonce was not used (or was rejected as stale); resync
+        # from the chain so later sends don't stall behind a gap
+        client.reset_nonce()
+        raise
+
+
+def _get_receipt(client: BlockchainClient, tx_hash: bytes):
+    """Fetch a receipt over HTTP (blocking); TransactionNotFound if not mined yet."""
+    return client.w3.eth.get_transaction_receipt(tx_hash)
+
+
+async def _get_receipt_ws(w3: AsyncWeb3, tx_hash: bytes):
+    """Fetch a receipt over the WebSocket connection, None if not mined yet."""
+    try:
+        return await w3.eth.get_transaction_receipt(tx_hash)
+    except TransactionNotFound:
+        return None
+
+
+async def _wait_for_inclusion(tx_hash: bytes, timeout: float):
+    """
+    Wait for a receipt by subscribing to newHeads over SEPOLIA_WS_URL.
+
+    The receipt is only requested when a new block arrives, so no RPCs are
+    spent while the transaction is pending.
+    """
+    async def wait():
+        async with AsyncWeb3(WebSocketProvider(SEPOLIA_WS_URL)) as w3:
+            subscription_id = await w3.eth.subscribe("newHeads")
+            try:
+                # The transaction may have been mined before we subscribed
+                receipt = await _get_receipt_ws(w3, tx_hash)
+                if receipt is not None:
+                    return receipt
+                async for _ in w3.socket.process_subscriptions():
+                    receipt = await _get_receipt_ws(w3, tx_hash)
+                    if receipt is not None:
+                        return receipt
+            finally:
+                await w3.eth.unsubscribe(subscription_id)
+
+    try:
+        return await asyncio.wait_for(wait(), timeout)
+    except asyncio.TimeoutError:
+        raise TransactionMaybeSent(f"Transaction {tx_hash.hex()} not mined after {timeout}s")
+
+
+async def _wait_for_receipt(
+    client: BlockchainClient,
+    tx_hash: bytes,
+    timeout: float = RECEIPT_TIMEOUT_SECONDS
+):
+    """
+    Wait for a transaction receipt without blocking the event loop.
+
+    Uses the newHeads subscription when SEPOLIA_WS_URL is configured and
+    falls back to polling over HTTP if the WebSocket path fails. The poll
+    interval grows exponentially from RECEIPT_POLL_START_SECONDS up to
+    RECEIPT_POLL_MAX_SECONDS, so quick inclusions return quickly while slow
+    ones don't hammer the RPC endpoint.
+
+    Raises TransactionMaybeSent if no receipt could be fetched in time.
+    """
+    deadline = time.monotonic() + timeout
+    if SEPOLIA_WS_URL and not MOCK_BLOCKCHAIN:
+        try:
+            return await _wait_for_inclusion(tx_hash, timeout)
+        except TransactionMaybeSent:
+            raise
+        except Exception as e:
+            logger.warning(f"WebSocket receipt wait failed, polling over HTTP: {e}")
+
+    delay = RECEIPT_POLL_START_SECONDS
+    while True:
+        try:
+            receipt = await _rpc_with_retry(_get_receipt, client, tx_hash)
+        except TransactionNotFound:
+            receipt = None
+        except Exception as e:
+            # The transaction is out; only its receipt is unavailable
+            raise TransactionMaybeSent(f"Receipt for {tx_hash.hex()} unavailable: {e}") from e
+
+        if receipt is not None:
+            return receipt
+        if time.monotonic() >= deadline:
+            raise TransactionMaybeSent(f"Transaction {tx_hash.hex()} not mined after {timeout}s")
+        await asyncio.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+        delay = min(delay * RECEIPT_POLL_BACKOFF, RECEIPT_POLL_MAX_SECONDS)
+
+
+@functools.lru_cache(maxsize=1024)
+def _mock_tx_hash(wallet: str, amount: int) -> str:
+    """Deterministic fake transaction hash for MOCK_BLOCKCHAIN."""
+    return "0x" + hashlib.sha256(f"{wallet}{amount}".encode()).hexdigest()
+
+
 async def send_reward(wallet: str, amount: int) -> str:
     """
     Send token rewards to a user's wallet.
@@ -208,11 +724,8 @@ async def send_reward(wallet: str, amount: int) -> str:
     client = get_client()
     
     if MOCK_BLOCKCHAIN:
-        import hashlib
         logger.info(f"[MOCK] Sending reward: {amount} tokens to {wallet}")
-        # Generate a fake hash
-        fake_hash = "0x" + hashlib.sha256(f"{wallet}{amount}".encode()).hexdigest()
-        return fake_hash
+        return _mock_tx_hash(wallet, amount)
 
     if not client.is_configured():
         logger.error("Blockchain client not configured")
@@ -220,33 +733,25 @@ async def send_reward(wallet: str, amount: int) -> str:
 
     try:
         # Convert to checksum address
-        recipient = Web3.to_checksum_address(wallet)
+        recipient = _checksum(wallet)
 
         # Get token decimals (usually 18)
-        decimals = client.token.functions.decimals().call()
+        decimals = await _rpc_with_retry(client.decimals)
         token_amount = amount * (10 ** decimals)
 
-        # Build transaction
-        nonce = client.w3.eth.get_transaction_count(client.account.address)
-
-        tx = client.token.functions.mint(
-            recipient,
-            token_amount
-        ).build_transaction({
-            'from': client.account.address,
-            'nonce': nonce,
-            'gas': 100000,
-            'gasPrice': client.w3.eth.gas_price
-        })
-
-        # Sign and send
-        signed_tx = client.w3.eth.account.sign_transaction(tx, PRIVATE_KEY)
-        tx_hash = client.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        # Build, sign and send
+        tx_hash = await _broadcast(
+            client,
+            client.token.address,
+            MINT_SELECTOR + abi_encode(["address", "uint256"], [recipient, token_amount]),
+            100000
+        )
 
         # Wait for confirmation
-        receipt = client.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+        receipt = await _wait_for_receipt(client, tx_hash)
 
         if receipt.status == 1:
+            _balance_cache.pop(recipient, None)
             tx_hash_str = "0x" + tx_hash.hex() if not tx_hash.hex().startswith("0x") else tx_hash.hex()
             logger.info(f"Reward sent: {amount} tokens to {wallet}, tx: {tx_hash_str}")
             return tx_hash_str
@@ -259,6 +764,126 @@ async def send_reward(wallet: str, amount: int) -> str:
         raise
 
 
+async def send_rewards_bulk(pairs: List[Tuple[str, int]]) -> str:
+    """
+    Send token rewards to many wallets in a single batchMint transaction.
+
+    Args:
+        pairs: List of (wallet address, amount in whole tokens)
+
+    Returns:
+        str: Transaction hash
+    """
+    client = get_client()
+
+    if MOCK_BLOCKCHAIN:
+        logger.info(f"[MOCK] Sending batch reward to {len(pairs)} wallets")
+        fake_hash = "0x" + hashlib.sha256(repr(pairs).encode()).hexdigest()
+        return fake_hash
+
+    if not client.is_configured():
+        logger.error("Blockchain client not configured")
+        return "0x" + "0" * 64  # Return dummy hash for testing
+
+    try:
+        decimals = await _rpc_with_retry(client.decimals)
+        unit = 10 ** decimals
+        recipients = [_checksum(wallet) for wallet, _ in pairs]
+        amounts = [amount * unit for _, amount in pairs]
+
+        tx_hash = await _broadcast(
+            client,
+            client.token.address,
+            BATCH_MINT_SELECTOR + abi_encode(["address[]", "uint256[]"], [recipients, amounts]),
+            50000 + 60000 * len(pairs)
+        )
+
+        receipt = await _wait_for_receipt(client, tx_hash)
+
+        if receipt.status == 1:
+            for recipient in recipients:
+                _balance_cache.pop(recipient, None)
+            tx_hash_str = "0x" + tx_hash.hex() if not tx_hash.hex().startswith("0x") else tx_hash.hex()
+            logger.info(f"Batch reward sent to {len(pairs)} wallets, tx: {tx_hash_str}")
+            return tx_hash_str
+        else:
+            raise Exception("Transaction failed")
+
+    except Exception as e:
+        logger.error(f"Error sending batch reward: {e}")
+        raise
+
+
+# Rewards waiting to be flushed as one batchMint
+_pending_rewards: List[Tuple[str, int, asyncio.Future]] = []
+_reward_flush_task: Optional[asyncio.Task] = None
+# Flush tasks; the event loop only keeps weak references to tasks
+_reward_flushes: set = set()
+
+
+def _schedule_reward_flush(delay: float = 0.0) -> asyncio.Task:
+    """Start a reward flush and keep a reference until it is done."""
+    task = asyncio.create_task(_flush_rewards(delay))
+    _reward_flushes.add(task)
+    task.add_done_callback(_reward_flushes.discard)
+    return task
+
+
+async def _flush_rewards(delay: float = 0.0) -> None:
+    """Send every queued reward in one batch and resolve the waiters."""
+    global _reward_flush_task
+    if delay:
+        await asyncio.sleep(delay)
+
+    batch = _pending_rewards[:]
+    _pending_rewards.clear()
+    _reward_flush_task = None
+    if not batch:
+        return
+
+    try:
+        tx_hash = await send_rewards_bulk([(wallet, amount) for wallet, amount, _ in batch])
+    except Exception as e:
+        for _, _, future in batch:
+            if not future.done():
+                future.set_exception(e)
+        return
+
+    for _, _, future in batch:
+        if not future.done():
+            future.set_result(tx_hash)
+
+
+async def queue_reward(wallet: str, amount: int) -> str:
+    """
+    Queue a reward to be minted together with other pending rewards.
+
+    The queue is flushed when it reaches REWARD_BATCH_MAX_SIZE entries or
+    REWARD_BATCH_WINDOW_SECONDS after the first queued reward.
+
+    Args:
+        wallet: Recipient's wallet address
+        amount: Number of tokens to send (in whole tokens, not wei)
+
+    Returns:
+        str: Hash of the batch transaction that carried this reward
+    """
+    global _reward_flush_task
+    future = asyncio.get_running_loop().create_future()
+    _pending_rewards.append((wallet, amount, future))
+
+    if len(_pending_rewards) >= REWARD_BATCH_MAX_SIZE:
+        _schedule_reward_flush()
+    elif _reward_flush_task is None:
+        _reward_flush_task = _schedule_reward_flush(REWARD_BATCH_WINDOW_SECONDS)
+
+    return await future
+
+
+# Claims currently being sent, keyed by (location hash, wallet, amount)
+_inflight_claims: Dict[Tuple[bytes, str, int], asyncio.Task] = {}
+
+
 async def distribute_reward_with_hash(
     wallet: str,
     location_hash: bytes,
@@ -268,7 +893,8 @@ async def distribute_reward_with_hash(
     Distribute reward through the RewardDistributor contract.
 
     This records the verification hash on-chain to prevent double-claiming
-    and distributes tokens to the user.
+    and distributes tokens to the user. A call identical to one that is
+    still in flight awaits that transaction instead of sending another.
 
     Args:
         wallet: Recipient's wallet address
@@ -278,6 +904,22 @@ async def distribute_reward_with_hash(
     Returns:
         str: Transaction hash
     """
+    key = (location_hash, wallet.lower(), amount)
+    task = _inflight_claims.get(key)
+    if task is None:
+        task = asyncio.create_task(_distribute_reward_with_hash(wallet, location_hash, amount))
+        _inflight_claims[key] = task
+        task.add_done_callback(lambda _: _inflight_claims.pop(key, None))
+    # Shield so one caller's cancellation doesn't cancel the shared send
+    return await asyncio.shield(task)
+
+
+async def _distribute_reward_with_hash(
+    wallet: str,
+    location_hash: bytes,
+    amount: int
+) -> str:
+    """Send a distributeReward transaction and wait for it to be mined."""
     client = get_client()
 
     if not client.distributor:
@@ -285,43 +927,37 @@ async def distribute_reward_with_hash(
         return await send_reward(wallet, amount)
 
     try:
-        recipient = Web3.to_checksum_address(wallet)
+        recipient = _checksum(wallet)
 
-        # Check if already verified
-        is_verified = client.distributor.functions.verificationRecords(
-            location_hash
-        ).call()
+        # Preflight reads (verification flag + decimals) in one call
+        is_verified, decimals = await _rpc_with_retry(
+            client.verification_with_decimals, location_hash
+        )
 
         if is_verified:
             logger.warning(f"Location already verified: {location_hash.hex()}")
             raise Exception("Location already verified")
 
-        # Get token decimals
-        decimals = client.token.functions.decimals().call()
         token_amount = amount * (10 ** decimals)
 
-        # Build transaction
-        nonce = client.w3.eth.get_transaction_count(client.account.address)
-
-        tx = client.distributor.functions.distributeReward(
-            recipient,
-            location_hash,
-            token_amount
-        ).build_transaction({
-            'from': client.account.address,
-            'nonce': nonce,
-            'gas': 300000,  # Increased from 150000
-            'gasPrice': client.w3.eth.gas_price
-        })
+        data = DISTRIBUTE_REWARD_SELECTOR + abi_encode(
+            ["address", "bytes32", "uint256"],
+            [recipient, location_hash, token_amount]
+        )
+        # Estimated per transaction: minting to a first-time holder costs
+        # noticeably more than to an existing one, so estimates aren't reused
+        gas = await _rpc_with_retry(_estimate_gas, client, client.distributor.address, data)
 
         # Sign and send
-        signed_tx = client.w3.eth.account.sign_transaction(tx, PRIVATE_KEY)
-        tx_hash = client.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        tx_hash = await _broadcast(client, client.distributor.address, data, gas)
 
         # Wait for confirmation
-        receipt = client.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+        receipt = await _wait_for_receipt(client, tx_hash)
 
         if receipt.status == 1:
+            # The location is verified on-chain now
+            _cache_verification(location_hash, True)
+            _balance_cache.pop(recipient, None)
             tx_hash_str = "0x" + tx_hash.hex() if not tx_hash.hex().startswith("0x") else tx_hash.hex()
             logger.info(f"Reward distributed: {amount} tokens to {wallet}, tx: {tx_hash_str}")
             return tx_hash_str
@@ -333,10 +969,168 @@ async def distribute_reward_with_hash(
         raise
 
 
+class _BatchNotSent(Exception):
+    """distributeRewardBatch failed before the transaction was broadcast."""
+
+
+async def distribute_rewards_batch(claims: List[Tuple[str, bytes, int]]) -> str:
+    """
+    Distribute many rewards in a single distributeRewardBatch transaction.
+
+    The contract reverts the whole batch if any location is already
+    verified; that shows up here as a gas estimation error before any
+    nonce is spent. Failures before the broadcast raise _BatchNotSent.
+
+    Args:
+        claims: List of (wallet address, location hash, amount in whole tokens)
+
+    Returns:
+        str: Transaction hash
+    """
+    client = get_client()
+
+    if MOCK_BLOCKCHAIN:
+        logger.info(f"[MOCK] Distributing batch reward to {len(claims)} wallets")
+        return "0x" + hashlib.sha256(repr(claims).encode()).hexdigest()
+
+    if not client.distributor:
+        raise _BatchNotSent("Distributor contract not configured")
+
+    try:
+        try:
+            decimals = await _rpc_with_retry(client.decimals)
+            unit = 10 ** decimals
+            data = DISTRIBUTE_REWARD_BATCH_SELECTOR + abi_encode(
+                ["address[]", "bytes32[]", "uint256[]"],
+                [
+                    [_checksum(wallet) for wallet, _, _ in claims],
+                    [location_hash for _, location_hash, _ in claims],
+                    [amount * unit for _, _, amount in claims]
+                ]
+            )
+            gas = await _rpc_with_retry(_estimate_gas, client, client.distributor.address, data)
+        except Exception as e:
+            raise _BatchNotSent(str(e)) from e
+
+        tx_hash = await _broadcast(client, client.distributor.address, data, gas)
+
+        receipt = await _wait_for_receipt(client, tx_hash)
+
+        if receipt.status == 1:
+            for wallet, location_hash, _ in claims:
+                _cache_verification(location_hash, True)
+                _balance_cache.pop(_checksum(wallet), None)
+            tx_hash_str = "0x" + tx_hash.hex() if not tx_hash.hex().startswith("0x") else tx_hash.hex()
+            logger.info(f"Batch reward distributed to {len(claims)} wallets, tx: {tx_hash_str}")
+            return tx_hash_str
+        else:
+            raise Exception("Transaction failed")
+
+    except Exception as e:
+        logger.error(f"Error distributing batch reward: {e}")
+        raise
+
+
+# Claims waiting to be flushed as one distributeRewardBatch
+_pending_claims: List[Tuple[str, bytes, int, asyncio.Future]] = []
+_claim_flush_task: Optional[asyncio.Task] = None
+# Flush tasks; the event loop only keeps weak references to tasks
+_claim_flushes: set = set()
+
+
+def _schedule_claim_flush(delay: float = 0.0) -> asyncio.Task:
+    """Start a claim flush and keep a reference until it is done."""
+    task = asyncio.create_task(_flush_claims(delay))
+    _claim_flushes.add(task)
+    task.add_done_callback(_claim_flushes.discard)
+    return task
+
+
+async def _settle_claim(wallet: str, location_hash: bytes, amount: int, future: asyncio.Future) -> None:
+    """Send one claim on its own and resolve its waiter."""
+    try:
+        result = await distribute_reward_with_hash(wallet, location_hash, amount)
+    except Exception as e:
+        if not future.done():
+            future.set_exception(e)
+        return
+    if not future.done():
+        future.set_result(result)
+
+
+async def _flush_claims(delay: float = 0.0) -> None:
+    """Send every queued claim in one batch and resolve the waiters."""
+    global _claim_flush_task
+    if delay:
+        await asyncio.sleep(delay)
+
+    batch = _pending_claims[:]
+    _pending_claims.clear()
+    _claim_flush_task = None
+    if not batch:
+        return
+
+    try:
+        tx_hash = await distribute_rewards_batch(
+            [(wallet, location_hash, amount) for wallet, location_hash, amount, _ in batch]
+        )
+    except _BatchNotSent as e:
+        # One bad claim (e.g. an already verified location) reverts the whole
+        # batch; send each claim on its own so the others still go through
+        logger.warning(f"Batch distribution failed, sending {len(batch)} claims individually: {e}")
+        await asyncio.gather(*(_settle_claim(*claim) for claim in batch))
+        return
+    except Exception as e:
+        # The batch was broadcast (TransactionMaybeSent) and may still be mined;
+        # resending the claims could pay them twice, so report to every waiter
+        for _, _, _, future in batch:
+            if not future.done():
+                future.set_exception(e)
+        return
+
+    for _, _, _, future in batch:
+        if not future.done():
+            future.set_result(tx_hash)
+
+
+async def queue_distribute_reward(wallet: str, location_hash: bytes, amount: int) -> str:
+    """
+    Queue a reward to be distributed together with other pending claims.
+
+    The queue is flushed when it reaches CLAIM_BATCH_MAX_SIZE entries or
+    CLAIM_BATCH_WINDOW_SECONDS after the first queued claim. Without a
+    distributor contract this falls back to distribute_reward_with_hash.
+
+    Args:
+        wallet: Recipient's wallet address
+        location_hash: Hash of the facility location (for duplicate prevention)
+        amount: Number of tokens to distribute
+
+    Returns:
+        str: Hash of the transaction that carried this reward
+    """
+    global _claim_flush_task
+    if not get_client().distributor:
+        return await distribute_reward_with_hash(wallet, location_hash, amount)
+
+    future = asyncio.get_running_loop().create_future()
+    _pending_claims.append((wallet, location_hash, amount, future))
+
+    if len(_pending_claims) >= CLAIM_BATCH_MAX_SIZE:
+        _schedule_claim_flush()
+    elif _claim_flush_task is None:
+        _claim_flush_task = _schedule_claim_flush(CLAIM_BATCH_WINDOW_SECONDS)
+
+    return await future
+
+
 async def get_balance(wallet: str) -> int:
     """
     Get the token balance for a wallet.
 
+    Results are cached for BALANCE_CACHE_TTL_SECONDS and dropped when this
+    process sends the wallet a reward.
+
     Args:
         wallet: Wallet address to check
 
@@ -350,15 +1144,35 @@ async def get_balance(wallet: str) -> int:
         return 0
 
     try:
-        address = Web3.to_checksum_address(wallet)
+        address = _checksum(wallet)
+    except Exception as e:
+        logger.error(f"Error getting balance: {e}")
+        return 0
 
+    cached = _balance_cache.get(address)
+    if cached is not None and time.monotonic() - cached[1] < BALANCE_CACHE_TTL_SECONDS:
+        _balance_cache.move_to_end(address)
+        return cached[0]
+
+    # Concurrent reads of the same wallet share one RPC
+    task = _inflight_balances.get(address)
+    if task is None:
+        task = asyncio.create_task(_fetch_balance(client, address))
+        _inflight_balances[address] = task
+        task.add_done_callback(lambda _: _inflight_balances.pop(address, None))
+    return await asyncio.shield(task)
+
+
+async def _fetch_balance(client: BlockchainClient, address: str) -> int:
+    """Read a balance over RPC and cache it; 0 (uncached) on error."""
+    try:
         # Get balance in wei
-        balance_wei = client.token.functions.balanceOf(address).call()
+        balance_wei, decimals = await asyncio.to_thread(client.balance_with_decimals, address)
 
         # Convert to whole tokens
-        decimals = client.token.functions.decimals().call()
         balance = balance_wei // (10 ** decimals)
 
+        _cache_balance(address, balance)
         return balance
 
     except Exception as e:
@@ -370,6 +1184,9 @@ async def check_verification(location_hash: bytes) -> bool:
     """
     Check if a location has already been verified.
 
+    Results are cached for VERIFICATION_CACHE_TTL_SECONDS so repeated checks
+    of the same hash don't each cost an eth_call.
+
     Args:
         location_hash: Hash of the facility location
 
@@ -381,21 +1198,32 @@ async def check_verification(location_hash: bytes) -> bool:
     if not client.distributor:
         return False
 
+    cached = _verification_cache.get(location_hash)
+    if cached is not None and time.monotonic() - cached[1] < VERIFICATION_CACHE_TTL_SECONDS:
+        _verification_cache.move_to_end(location_hash)
+        return cached[0]
+
     try:
-        return client.distributor.functions.verificationRecords(
-            location_hash
-        ).call()
+        is_verified = await asyncio.to_thread(
+            client.distributor.functions.verificationRecords(location_hash).call
+        )
+        _cache_verification(location_hash, is_verified)
+        return is_verified
 
     except Exception as e:
         logger.error(f"Error checking verification: {e}")
         return False
 
 
+# typed: an int 31 and a float 31.0 are equal keys but hash differently
+# ("31" vs "31.0"), so they must be cached separately
+@functools.lru_cache(maxsize=4096, typed=True)
 def generate_location_hash(lat: float, lng: float, facility_type: str) -> bytes:
     """
     Generate a unique hash for a facility location.
 
-    This is used to prevent duplicate verifications on-chain.
+    This is used to prevent duplicate verifications on-chain. Results are
+    cached on the exact arguments, since reward and verify calls repeat them.
 
     Args:
         lat: Latitude (rounded to 5 decimal places ~1m precision)
@@ -413,7 +1241,36 @@ def generate_location_hash(lat: float, lng: float, facility_type: str) -> bytes:
     location_str = f"{lat_rounded}:{lng_rounded}:{facility_type}"
 
     # Hash it
-    return Web3.keccak(text=location_str)
+    return keccak(location_str.encode())
+
+
+def generate_location_hashes(
+    lats: Sequence[float],
+    lngs: Sequence[float],
+    facility_types: Sequence[str]
+) -> List[bytes]:
+    """
+    Generate location hashes for many facilities at once (e.g. backfills).
+
+    Produces exactly the same hashes as generate_location_hash. Coordinates
+    are rounded with Python's round() rather than np.round, whose scaled
+    rounding can differ in the last digit and would change the hash, and
+    are not converted to float (an integer 31 must hash as "31", not "31.0").
+    The ":<type>" suffix is encoded once per distinct facility type.
+
+    Args:
+        lats: Latitudes (lists or NumPy arrays)
+        lngs: Longitudes
+        facility_types: Facility types, matched by index
+
+    Returns:
+        List of 32-byte hashes
+    """
+    suffixes = {facility_type: f":{facility_type}".encode() for facility_type in set(facility_types)}
+    return [
+        keccak(f"{round(lat, 5)}:{round(lng, 5)}".encode() + suffixes[facility_type])
+        for lat, lng, facility_type in zip(lats, lngs, facility_types)
+    ]
 
 
 # Skill registration for SpoonOS
@@ -427,6 +1284,10 @@ def skill(name: str):
 
 # Register skills
 send_reward = skill("send_reward")(send_reward)
+send_rewards_bulk = skill("send_rewards_bulk")(send_rewards_bulk)
+queue_reward = skill("queue_reward")(queue_reward)
 distribute_reward_with_hash = skill("distribute_reward_with_hash")(distribute_reward_with_hash)
+distribute_rewards_batch = skill("distribute_rewards_batch")(distribute_rewards_batch)
+queue_distribute_reward = skill("queue_distribute_reward")(queue_distribute_reward)
 get_balance = skill("get_balance")(get_balance)
 check_verification = skill("check_verification")(check_verification)
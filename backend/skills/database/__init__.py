@@ -1,22 +1,34 @@
 """Database Skill - PostgreSQL + PostGIS operations."""
 from .skill import (
     save_facility,
+    save_facilities_bulk,
     check_existing,
+    check_existing_bulk,
     query_facilities_nearby,
     update_facility,
+    submit_facility,
     save_reward,
+    save_rewards_bulk,
+    queue_reward_record,
     get_user_rewards,
+    get_total_rewards,
     get_facility_by_id,
     DatabasePool
 )
 
 __all__ = [
     "save_facility",
+    "save_facilities_bulk",
     "check_existing",
+    "check_existing_bulk",
     "query_facilities_nearby",
     "update_facility",
+    "submit_facility",
     "save_reward",
+    "save_rewards_bulk",
+    "queue_reward_record",
     "get_user_rewards",
+    "get_total_rewards",
     "get_facility_by_id",
     "DatabasePool"
 ]
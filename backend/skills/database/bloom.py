@@ -0,0 +1,59 @@
+"""
+Bloom filter over occupied (facility type, geohash cell) pairs.
+
+Handles:
+- Fast "definitely no facility here" answers for the duplicate check
+- Tracking cells as facilities are inserted
+"""
+
+import math
+import hashlib
+
+
+class FacilityBloomFilter:
+    """
+    In-memory bloom filter of cells that contain a facility of a given type.
+
+    A negative answer is exact; a positive answer may be a false positive and
+    must be confirmed against the database. The filter only knows about rows
+    inserted through this process or loaded by rebuild(), so it is only marked
+    ready once it has been loaded from the database.
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.01):
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.ready = False
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, facility_type: str, cell: str) -> None:
+        """Mark a cell as containing a facility of the given type."""
+        for pos in self._positions(f"{facility_type}:{cell}"):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def might_contain(self, facility_type: str, cell: str) -> bool:
+        """Check whether a cell may contain a facility of the given type."""
+        bits = self._bits
+        return all(
+            bits[pos >> 3] & (1 << (pos & 7))
+            for pos in self._positions(f"{facility_type}:{cell}")
+        )
+
+    def rebuild(self, entries) -> None:
+        """
+        Replace the filter contents.
+
+        Args:
+            entries: Iterable of (facility_type, cell) pairs
+        """
+        self._bits = bytearray(len(self._bits))
+        for facility_type, cell in entries:
+            self.add(facility_type, cell)
+        self.ready = True
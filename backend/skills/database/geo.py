@@ -0,0 +1,182 @@
+"""
+Geospatial helpers shared by the database and anti-fraud skills.
+
+Handles:
+- Geohash encoding of coordinates
+- Neighbouring geohash cells and their width
+- Vectorized great-circle distances
+- Coordinate bounding boxes around a radius
+"""
+
+import math
+from typing import List, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_METERS = 6371000
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash_encode(lat: float, lng: float, precision: int = 8) -> str:
+    """
+    Encode a coordinate as a geohash string.
+
+    Args:
+        lat: Latitude coordinate
+        lng: Longitude coordinate
+        precision: Number of geohash characters (8 ~ 38m x 19m cell)
+
+    Returns:
+        Geohash string of the requested length
+    """
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            if lng >= mid:
+                bits = (bits << 1) | 1
+                lng_lo = mid
+            else:
+                bits <<= 1
+                lng_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                bits = (bits << 1) | 1
+                lat_lo = mid
+            else:
+                bits <<= 1
+                lat_hi = mid
+        even = not even
+        bit_count += 1
+
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(chars)
+
+
+def geohash_cell_width_m(lat: float, precision: int) -> float:
+    """
+    East-west width in meters of a geohash cell at the given latitude.
+
+    This is the cell's narrowest side away from the equator, so a radius
+    up to this width is covered by the 3x3 block from geohash_neighbors.
+    """
+    lng_bits = (5 * precision + 1) // 2
+    return math.radians(360.0 / (1 << lng_bits)) * EARTH_RADIUS_METERS * math.cos(math.radians(lat))
+
+
+def geohash_neighbors(geohash: str) -> List[str]:
+    """
+    Get a geohash cell and its (up to) eight neighbours.
+
+    Args:
+        geohash: Geohash string
+
+    Returns:
+        List of distinct geohashes of the same precision, the cell itself first
+    """
+    precision = len(geohash)
+    lng_bits = (precision * 5 + 1) // 2
+    lat_bits = precision * 5 // 2
+    cell_lat = 180.0 / (1 << lat_bits)
+    cell_lng = 360.0 / (1 << lng_bits)
+
+    # Decode to the cell centre by replaying the bisection
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    even = True
+    for char in geohash:
+        value = _BASE32.index(char)
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            if even:
+                mid = (lng_lo + lng_hi) / 2
+                if bit:
+                    lng_lo = mid
+                else:
+                    lng_hi = mid
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                if bit:
+                    lat_lo = mid
+                else:
+                    lat_hi = mid
+            even = not even
+    lat = (lat_lo + lat_hi) / 2
+    lng = (lng_lo + lng_hi) / 2
+
+    cells = [geohash]
+    for dlat in (-cell_lat, 0.0, cell_lat):
+        n_lat = lat + dlat
+        if not -90.0 < n_lat < 90.0:
+            continue
+        for dlng in (-cell_lng, 0.0, cell_lng):
+            n_lng = (lng + dlng + 180.0) % 360.0 - 180.0
+            cell = geohash_encode(n_lat, n_lng, precision)
+            if cell not in cells:
+                cells.append(cell)
+    return cells
+
+
+def haversine_m(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """
+    Great-circle distance from one point to many, vectorized.
+
+    Args:
+        lat: Latitude of the query point
+        lng: Longitude of the query point
+        lats: Array of candidate latitudes
+        lngs: Array of candidate longitudes
+
+    Returns:
+        Array of distances in meters
+    """
+    dlat = np.radians(lats - lat)
+    dlng = np.radians(lngs - lng)
+    a = (
+        np.sin(dlat / 2) ** 2
+        + np.cos(np.radians(lat)) * np.cos(np.radians(lats)) * np.sin(dlng / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(a))
+
+
+# Widens bounding boxes to cover the WGS84 spheroid, on which a degree of
+# latitude can be up to ~0.6% shorter than on the sphere used here
+_BBOX_MARGIN = 1.01
+
+
+def bounding_box(lat: float, lng: float, radius: float) -> Tuple[float, float, float, float]:
+    """
+    Latitude/longitude box containing every point within a radius.
+
+    Near the poles, or when the box would cross the antimeridian, the
+    longitude range is left unbounded.
+
+    Args:
+        lat: Latitude of the center
+        lng: Longitude of the center
+        radius: Radius in meters
+
+    Returns:
+        (min_lat, max_lat, min_lng, max_lng)
+    """
+    dlat = math.degrees(radius / EARTH_RADIUS_METERS) * _BBOX_MARGIN
+    min_lat, max_lat = lat - dlat, lat + dlat
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0
+
+    dlng = dlat / math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if lng - dlng < -180 or lng + dlng > 180:
+        return min_lat, max_lat, -180.0, 180.0
+    return min_lat, max_lat, lng - dlng, lng + dlng
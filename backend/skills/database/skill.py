@@ -9,17 +9,38 @@ Handles all database operations including:
 """
 
 import os
+import ssl
+import struct
 import uuid
+import asyncio
 import logging
+from collections import Counter
+from itertools import chain
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 from dotenv import load_dotenv
-load_dotenv()
+
+# main.py loads .env before importing any skill; only parse it again when
+# the skill is imported on its own (scripts, REPL)
+if "DATABASE_URL" not in os.environ:
+    load_dotenv()
 
 import asyncpg
+import numpy as np
+import orjson
+from cachetools import TTLCache
 from pydantic import BaseModel
 
+from skills.database.bloom import FacilityBloomFilter
+from skills.database.geo import (
+    bounding_box,
+    geohash_cell_width_m,
+    geohash_encode,
+    geohash_neighbors,
+    haversine_m
+)
+
 logger = logging.getLogger(__name__)
 
 # Database connection settings
@@ -29,12 +50,353 @@ DATABASE_URL = os.getenv(
 )
 MOCK_DATABASE = os.getenv("MOCK_DATABASE", "false").lower() == "true"
 
+# Bloom filter of occupied (type, geohash7) cells, loaded when the pool opens.
+# Only safe when every insert goes through this process (single worker), since
+# inserts made by other processes never reach this process's filter.
+FRAUD_BLOOM_FILTER = os.getenv("FRAUD_BLOOM_FILTER", "false").lower() == "true"
+BLOOM_GEOHASH_PRECISION = 7  # ~150m cells, so a 3x3 block covers a 50m radius
+FACILITY_BLOOM = FacilityBloomFilter()
+
+# Connection pool sizing
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "10"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "50"))
+DB_COMMAND_TIMEOUT = float(os.getenv("DB_COMMAND_TIMEOUT", "10"))
+# Seconds before asyncpg closes an idle connection above min_size; 0 keeps
+# them open (the keepalive task pings idle connections instead)
+DB_POOL_IDLE_TTL = float(os.getenv("DB_POOL_IDLE_TTL", "0"))
+POOL_KEEPALIVE_SECONDS = 60
+
+# TLS to the database: "require" encrypts without verifying the server
+# certificate (Supabase's default chain is not in the system CA bundle),
+# "verify-full" checks it against DB_SSL_ROOT_CERT or the system CAs,
+# "disable" connects in plain text (local development only)
+DB_SSLMODE = os.getenv("DB_SSLMODE", "require").lower()
+DB_SSL_ROOT_CERT = os.getenv("DB_SSL_ROOT_CERT")
+
+
+def _build_ssl_context():
+    """Build the SSL context for DB_SSLMODE, or False to connect without TLS."""
+    if DB_SSLMODE == "disable":
+        return False
+    ssl_context = ssl.create_default_context(cafile=DB_SSL_ROOT_CERT)
+    if DB_SSLMODE != "verify-full":
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+    return ssl_context
+
+
+SSL_CONTEXT = _build_ssl_context()
+
+# Short-lived read caches for the upload flow, which looks up the same
+# coordinates and ids several times. Writes from this process clear them;
+# writes from other workers show up once the TTL expires.
+READ_CACHE_TTL_SECONDS = 30
+_existing_cache: TTLCache = TTLCache(maxsize=10_000, ttl=READ_CACHE_TTL_SECONDS)
+_facility_cache: TTLCache = TTLCache(maxsize=4096, ttl=READ_CACHE_TTL_SECONDS)
+_nearby_cache: TTLCache = TTLCache(maxsize=10_000, ttl=READ_CACHE_TTL_SECONDS)
+
+# Bumped by every facility write. A read stores its result only if no write
+# happened while it ran, so a query that started before the write can't put
+# the pre-write result back for a whole TTL.
+_cache_generation = 0
+
+
+def _invalidate_read_caches(facility_id: Optional[str] = None) -> None:
+    """Drop cached reads after a facility write from this process."""
+    global _cache_generation
+    _cache_generation += 1
+    _existing_cache.clear()
+    _nearby_cache.clear()
+    if facility_id is not None:
+        _facility_cache.pop(facility_id, None)
+
+# Reward records queued by queue_reward_record are written in batches of up
+# to REWARD_RECORD_BATCH_MAX_SIZE, at most REWARD_RECORD_WINDOW_SECONDS after
+# the first one; past REWARD_RECORD_MAX_PENDING callers write synchronously
+REWARD_RECORD_BATCH_MAX_SIZE = 64
+REWARD_RECORD_WINDOW_SECONDS = 0.1
+REWARD_RECORD_MAX_PENDING = 1024
+# Records that failed for any reason other than bad data are requeued and
+# retried after a delay that doubles up to REWARD_RECORD_RETRY_MAX_SECONDS
+REWARD_RECORD_RETRY_SECONDS = 1.0
+REWARD_RECORD_RETRY_MAX_SECONDS = 60.0
+
+# Schema PostGIS is installed in (Supabase uses "extensions")
+POSTGIS_SCHEMA = os.getenv("POSTGIS_SCHEMA", "public")
+
+# Points travel as binary EWKB: little-endian Point with the SRID flag set
+_EWKB_POINT = struct.Struct("<BIIdd")
+_EWKB_POINT_TYPE = 0x20000001
+_SRID_WGS84 = 4326
+
+# Hot queries, prepared once per connection by asyncpg's statement cache.
+# Geography parameters are (lng, lat) tuples, see _encode_point.
+# Ids come from the column default and are handed back by RETURNING
+SAVE_FACILITY_SQL = """
+    INSERT INTO facilities (
+        type, location, image_url,
+        ai_analysis, contributor_address, created_at, updated_at
+    ) VALUES (
+        $1, $2::geography, $3, $4, $5, NOW(), NOW()
+    )
+    RETURNING id
+"""
+
+# Bulk facility inserts: COPY into a staging table, then build the points
+# server-side in one INSERT ... SELECT
+FACILITY_STAGE_SQL = """
+    CREATE TEMP TABLE _facility_stage (
+        id UUID,
+        type VARCHAR(20),
+        longitude DOUBLE PRECISION,
+        latitude DOUBLE PRECISION,
+        image_url TEXT,
+        ai_analysis TEXT,
+        contributor_address VARCHAR(42)
+    ) ON COMMIT DROP
+"""
+
+FACILITY_STAGE_COLUMNS = [
+    "id", "type", "longitude", "latitude",
+    "image_url", "ai_analysis", "contributor_address"
+]
+
+INSERT_STAGED_FACILITIES_SQL = """
+    INSERT INTO facilities (
+        id, type, location, image_url,
+        ai_analysis, contributor_address, created_at, updated_at
+    )
+    SELECT
+        id, type, ST_SetSRID(ST_MakePoint(longitude, latitude), 4326),
+        image_url, ai_analysis::jsonb, contributor_address, NOW(), NOW()
+    FROM _facility_stage
+"""
+
+# $3-$6 are a latitude/longitude box around the radius (geo.bounding_box):
+# plain comparisons on the stored coordinate columns reject the GiST
+# candidates outside it before ST_DWithin does any spheroidal math.
+CHECK_EXISTING_RADIUS_METERS = 50
+
+CHECK_EXISTING_SQL = """
+    SELECT
+        id, type,
+        longitude, latitude,
+        image_url, ai_analysis, contributor_address,
+        created_at, updated_at,
+        (CURRENT_DATE - updated_at::date) as days_since_update
+    FROM facilities
+    WHERE type = $1
+    AND latitude BETWEEN $3 AND $4
+    AND longitude BETWEEN $5 AND $6
+    AND ST_DWithin(location, $2::geography, 50)  -- 50 meters radius
+    ORDER BY updated_at DESC
+    LIMIT 1
+"""
+
+# check_existing for many probes at once; one row per probe, in probe order,
+# with NULL facility columns where nothing matched
+CHECK_EXISTING_BULK_SQL = """
+    SELECT
+        p.idx, f.*
+    FROM unnest($1::float8[], $2::float8[], $3::text[])
+        WITH ORDINALITY AS p(lat, lng, type, idx)
+    LEFT JOIN LATERAL (
+        SELECT
+            id, type,
+            longitude, latitude,
+            image_url, ai_analysis, contributor_address,
+            created_at, updated_at,
+            (CURRENT_DATE - updated_at::date) as days_since_update
+        FROM facilities
+        WHERE facilities.type = p.type
+        AND ST_DWithin(
+            location,
+            ST_SetSRID(ST_MakePoint(p.lng, p.lat), 4326)::geography,
+            50  -- 50 meters radius
+        )
+        ORDER BY updated_at DESC
+        LIMIT 1
+    ) f ON true
+    ORDER BY p.idx
+"""
+
+# $3 is the limit and $4-$7 the bounding box of the radius, as in
+# CHECK_EXISTING_SQL. Rows come back in GiST index order via the KNN <->
+# operator, so only $3 rows are visited instead of sorting every match by
+# ST_Distance. A covering GiST index (INCLUDE ...) cannot make this
+# index-only: the geography opclass stores bounding boxes, so location
+# itself must come from the heap for ST_Distance. Heap fetches are kept
+# local by the CLUSTER in migration 002.
+NEARBY_FACILITIES_SQL = """
+    SELECT
+        id, type,
+        longitude, latitude,
+        ST_Distance(location, $1::geography) as distance,
+        image_url, ai_analysis, contributor_address,
+        created_at, updated_at
+    FROM facilities
+    WHERE latitude BETWEEN $4 AND $5
+    AND longitude BETWEEN $6 AND $7
+    AND ST_DWithin(location, $1::geography, $2)
+    ORDER BY location <-> $1::geography
+    LIMIT $3
+"""
+
+# NEARBY_FACILITIES_SQL filtered to one type ($3); the limit and box shift
+# to $4-$8. A separate statement rather than "$3 IS NULL OR type = $3", so
+# the cached generic plan of each shape can use the type filter as-is.
+NEARBY_FACILITIES_BY_TYPE_SQL = """
+    SELECT
+        id, type,
+        longitude, latitude,
+        ST_Distance(location, $1::geography) as distance,
+        image_url, ai_analysis, contributor_address,
+        created_at, updated_at
+    FROM facilities
+    WHERE type = $3
+    AND latitude BETWEEN $5 AND $6
+    AND longitude BETWEEN $7 AND $8
+    AND ST_DWithin(location, $1::geography, $2)
+    ORDER BY location <-> $1::geography
+    LIMIT $4
+"""
+
+# One statement for every update_facility call; a NULL parameter (field not
+# given) keeps the current value
+UPDATE_FACILITY_SQL = """
+    UPDATE facilities
+    SET image_url = COALESCE($2, image_url),
+        ai_analysis = COALESCE($3, ai_analysis),
+        updated_at = NOW()
+    WHERE id = $1
+"""
+
+# Rate check, duplicate check and insert/update in one call
+# (database/migrations/007); $5 ai_analysis is jsonb
+SUBMIT_FACILITY_SQL = """
+    SELECT * FROM submit_facility($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
+"""
+
+SAVE_REWARD_SQL = """
+    INSERT INTO rewards (
+        wallet_address, facility_id, amount, tx_hash, created_at
+    ) VALUES ($1, $2, $3, $4, NOW())
+    RETURNING id
+"""
+
+# Columns COPY'd by save_rewards_bulk; the rest come from column defaults
+REWARD_COPY_COLUMNS = ["wallet_address", "facility_id", "amount", "tx_hash"]
+
+# The wallet's total rides along on every row, so one round trip covers both
+USER_REWARDS_SQL = """
+    SELECT
+        r.id, r.facility_id, r.amount, r.tx_hash, r.created_at,
+        f.type as facility_type,
+        SUM(r.amount) OVER () as total_earned
+    FROM rewards r
+    LEFT JOIN facilities f ON r.facility_id = f.id
+    WHERE r.wallet_address = $1
+    ORDER BY r.created_at DESC
+"""
+
+# Running per-wallet total kept by a trigger on rewards (database/migrations/010)
+TOTAL_REWARDS_SQL = """
+    SELECT total_amount FROM wallet_totals WHERE wallet_address = $1
+"""
+
+FACILITY_BY_ID_SQL = """
+    SELECT
+        id, type,
+        longitude, latitude,
+        image_url, ai_analysis, contributor_address,
+        created_at, updated_at
+    FROM facilities
+    WHERE id = $1
+"""
+
 # In-memory storage for mock mode
 MOCK_DATA = {
     "facilities": [],
     "rewards": []
 }
 
+# Column arrays mirroring MOCK_DATA["facilities"] for vectorized lookups
+MOCK_INDEX = {
+    "lat": np.empty(0, dtype=np.float64),
+    "lng": np.empty(0, dtype=np.float64),
+    "type": np.empty(0, dtype=np.int8),
+    "contributor": np.empty(0, dtype=object),
+    "created_at_epoch": np.empty(0, dtype=np.float64)
+}
+
+# Facility type -> small integer code stored in MOCK_INDEX["type"], so type
+# filters compare int8 columns instead of Python strings
+MOCK_TYPE_IDS: Dict[str, int] = {}
+
+# Column arrays mirroring MOCK_DATA["rewards"]
+MOCK_REWARD_INDEX = {
+    "wallet": np.empty(0, dtype=object),
+    "amount": np.empty(0, dtype=np.int64)
+}
+
+# Facility id -> position in MOCK_DATA["facilities"]
+MOCK_FACILITY_ROWS: Dict[str, int] = {}
+
+# Mock facility row indices bucketed by geohash7 cell (~150m); a radius up to
+# one cell width is covered by the 3x3 block of cells around the query point
+MOCK_GEOHASH_PRECISION = 7
+MOCK_BUCKETS: Dict[str, List[int]] = {}
+
+# Running mock statistics, maintained on insert/update
+MOCK_STATS = {
+    "contributors": Counter(),            # facilities per contributor
+    "updated_by_contributor": Counter(),  # facilities updated at least once
+    "updated_total": 0
+}
+
+
+def mock_facilities_within(
+    lat: float,
+    lng: float,
+    radius: float,
+    facility_type: Optional[str] = None
+) -> List[tuple]:
+    """
+    Find mock facilities within a radius, nearest first.
+
+    Args:
+        lat: Latitude coordinate
+        lng: Longitude coordinate
+        radius: Search radius in meters
+        facility_type: Optional filter by type
+
+    Returns:
+        List of (facility dict, distance in meters) tuples
+    """
+    if radius <= geohash_cell_width_m(lat, MOCK_GEOHASH_PRECISION):
+        cells = geohash_neighbors(geohash_encode(lat, lng, MOCK_GEOHASH_PRECISION))
+        idx = np.fromiter(
+            chain.from_iterable(MOCK_BUCKETS.get(cell, ()) for cell in cells),
+            dtype=np.intp
+        )
+    else:
+        idx = np.arange(len(MOCK_INDEX["lat"]))
+
+    if facility_type:
+        type_id = MOCK_TYPE_IDS.get(facility_type)
+        if type_id is None:
+            return []
+        idx = idx[MOCK_INDEX["type"][idx] == type_id]
+    if idx.size == 0:
+        return []
+
+    dist = haversine_m(lat, lng, MOCK_INDEX["lat"][idx], MOCK_INDEX["lng"][idx])
+    hits = np.flatnonzero(dist <= radius)
+    hits = hits[np.argsort(dist[hits])]
+
+    facilities = MOCK_DATA["facilities"]
+    return [(facilities[idx[i]], float(dist[i])) for i in hits]
+
 
 class MockRecord(dict):
     """Mock database record that behaves like asyncpg Record."""
@@ -50,122 +412,148 @@ class MockConnection:
         # specific handling for INSERT/UPDATE
         if "INSERT INTO facilities" in query:
             # Extract values from args based on query structure
-            # args: id, type, longitude, latitude, image_url, ai_analysis, contributor_address
+            # args: type, (longitude, latitude), image_url, ai_analysis, contributor_address
+            # (the id stands in for the column default and is returned)
+            now = datetime.now()
+            now_epoch = now.timestamp()
             facility = {
-                "id": args[0],
-                "type": args[1],
-                "longitude": args[2],
-                "latitude": args[3],
-                "image_url": args[4],
-                "ai_analysis": args[5],
-                "contributor_address": args[6],
-                "created_at": datetime.now(),
-                "updated_at": datetime.now()
+                "id": str(uuid.uuid4()),
+                "type": args[0],
+                "longitude": args[1][0],
+                "latitude": args[1][1],
+                "image_url": args[2],
+                "ai_analysis": args[3],
+                "contributor_address": args[4],
+                "created_at": now,
+                "updated_at": now,
+                "created_at_epoch": now_epoch,
+                "updated_at_epoch": now_epoch
             }
+            MOCK_BUCKETS.setdefault(
+                geohash_encode(facility["latitude"], facility["longitude"], MOCK_GEOHASH_PRECISION),
+                []
+            ).append(len(MOCK_DATA["facilities"]))
+            MOCK_FACILITY_ROWS[facility["id"]] = len(MOCK_DATA["facilities"])
             MOCK_DATA["facilities"].append(facility)
+            MOCK_INDEX["lat"] = np.append(MOCK_INDEX["lat"], facility["latitude"])
+            MOCK_INDEX["lng"] = np.append(MOCK_INDEX["lng"], facility["longitude"])
+            type_id = MOCK_TYPE_IDS.setdefault(facility["type"], len(MOCK_TYPE_IDS))
+            MOCK_INDEX["type"] = np.append(MOCK_INDEX["type"], np.int8(type_id))
+            MOCK_INDEX["contributor"] = np.append(
+                MOCK_INDEX["contributor"], facility["contributor_address"]
+            )
+            MOCK_INDEX["created_at_epoch"] = np.append(
+                MOCK_INDEX["created_at_epoch"], now_epoch
+            )
+            MOCK_STATS["contributors"][facility["contributor_address"]] += 1
+            return facility["id"]
         
         elif "INSERT INTO rewards" in query:
-            # args: id, wallet_address, facility_id, amount, tx_hash
+            # args: wallet_address, facility_id, amount, tx_hash
             reward = {
-                "id": args[0],
-                "wallet_address": args[1],
-                "facility_id": args[2],
-                "amount": args[3],
-                "tx_hash": args[4],
+                "id": str(uuid.uuid4()),
+                "wallet_address": args[0],
+                "facility_id": args[1],
+                "amount": args[2],
+                "tx_hash": args[3],
                 "created_at": datetime.now()
             }
             MOCK_DATA["rewards"].append(reward)
+            MOCK_REWARD_INDEX["wallet"] = np.append(MOCK_REWARD_INDEX["wallet"], reward["wallet_address"])
+            MOCK_REWARD_INDEX["amount"] = np.append(MOCK_REWARD_INDEX["amount"], reward["amount"])
+            return reward["id"]
             
         elif "UPDATE facilities" in query:
-            # args: values..., facility_id
-            facility_id = args[-1]
-            for f in MOCK_DATA["facilities"]:
-                if f["id"] == facility_id:
-                    # simplistic update - we don't parse the query fully, 
-                    # but we know what update_facility passes
-                    # This is a bit fragile but works for the specific usage in update_facility
-                    if len(args) > 1 and "image_url" in query:
-                        # Assuming the first arg is image_url or ai_analysis depending on query
-                        # This mock is very specific to the current usage
-                        pass 
-                    f["updated_at"] = datetime.now()
-                    break
+            # args: facility_id, values...
+            facility_id = args[0]
+            row = MOCK_FACILITY_ROWS.get(facility_id)
+            if row is not None:
+                f = MOCK_DATA["facilities"][row]
+                # simplistic update - only the timestamps are tracked
+                if f["updated_at"] == f["created_at"]:
+                    MOCK_STATS["updated_by_contributor"][f["contributor_address"]] += 1
+                    MOCK_STATS["updated_total"] += 1
+                f["updated_at"] = datetime.now()
+                f["updated_at_epoch"] = f["updated_at"].timestamp()
+
+    async def executemany(self, query, args):
+        for record in args:
+            await self.execute(query, *record)
 
     async def fetch(self, query, *args):
         # Mock query logic
         results = []
         if "FROM facilities" in query:
-            # Simple radius check mock
-            lat = args[0]
-            lng = args[1]
-            radius = args[2]
-            
-            for f in MOCK_DATA["facilities"]:
-                # Simple distance calc (Euclidean approximation for mock)
-                # In real app PostGIS does this
-                dist = ((f["latitude"] - lat)**2 + (f["longitude"] - lng)**2)**0.5 * 111000
-                if dist <= radius:
-                    f_copy = f.copy()
-                    f_copy["distance"] = dist
-                    results.append(MockRecord(f_copy))
+            # args: (lng, lat), radius, [facility_type,] limit
+            lng, lat = args[0]
+            radius = args[1]
+            if query is NEARBY_FACILITIES_BY_TYPE_SQL:
+                facility_type, limit = args[2], args[3]
+            else:
+                facility_type, limit = None, args[2]
+
+            for f, dist in mock_facilities_within(lat, lng, radius, facility_type)[:limit]:
+                f_copy = f.copy()
+                f_copy["distance"] = dist
+                results.append(MockRecord(f_copy))
                     
         elif "FROM rewards" in query:
             wallet = args[0]
-            for r in MOCK_DATA["rewards"]:
-                if r["wallet_address"] == wallet:
-                    # Join facility info
-                    r_copy = r.copy()
-                    fac = next((f for f in MOCK_DATA["facilities"] if f["id"] == r["facility_id"]), None)
-                    if fac:
-                        r_copy["facility_type"] = fac["type"]
-                    results.append(MockRecord(r_copy))
+            rows = np.flatnonzero(MOCK_REWARD_INDEX["wallet"] == wallet)
+            total = int(MOCK_REWARD_INDEX["amount"][rows].sum())
+            for i in rows:
+                r = MOCK_DATA["rewards"][i]
+                # Join facility info
+                r_copy = r.copy()
+                r_copy["total_earned"] = total
+                fac_row = MOCK_FACILITY_ROWS.get(r["facility_id"])
+                if fac_row is not None:
+                    r_copy["facility_type"] = MOCK_DATA["facilities"][fac_row]["type"]
+                results.append(MockRecord(r_copy))
                     
         return results
 
     async def fetchrow(self, query, *args):
         if "FROM facilities" in query and "LIMIT 1" in query:
             # check_existing mock
-            # args: facility_type, lng, lat
-            if len(args) >= 3:
+            # args: facility_type, (lng, lat)
+            if len(args) >= 2:
                 f_type = args[0]
-                lng = args[1]
-                lat = args[2]
-                for f in MOCK_DATA["facilities"]:
-                    if f["type"] == f_type:
-                        dist = ((f["latitude"] - lat)**2 + (f["longitude"] - lng)**2)**0.5 * 111000
-                        if dist < 50: # 50m check
-                            res = f.copy()
-                            res["days_since_update"] = (datetime.now() - f["updated_at"]).days
-                            return MockRecord(res)
+                lng, lat = args[1]
+                matches = mock_facilities_within(lat, lng, 50, f_type)  # 50m check
+                if matches:
+                    f = max((m[0] for m in matches), key=lambda m: m["updated_at"])
+                    res = f.copy()
+                    res["days_since_update"] = (datetime.now().date() - f["updated_at"].date()).days
+                    return MockRecord(res)
                             
         if "FROM facilities" in query and "WHERE id =" in query:
             # get_facility_by_id
-            f_id = args[0]
-            for f in MOCK_DATA["facilities"]:
-                if f["id"] == f_id:
-                    return MockRecord(f)
+            row = MOCK_FACILITY_ROWS.get(args[0])
+            if row is not None:
+                return MockRecord(MOCK_DATA["facilities"][row])
 
-        if "SELECT COALESCE(SUM(amount), 0)" in query:
-            wallet = args[0]
-            total = sum(r["amount"] for r in MOCK_DATA["rewards"] if r["wallet_address"] == wallet)
-            return total
-            
         return None
 
     async def fetchval(self, query, *args):
+        if query.lstrip().startswith(("INSERT", "UPDATE")):
+            return await self.execute(query, *args)
+        if "FROM wallet_totals" in query:
+            rows = MOCK_REWARD_INDEX["wallet"] == args[0]
+            return int(MOCK_REWARD_INDEX["amount"][rows].sum()) if rows.any() else None
         row = await self.fetchrow(query, *args)
         if row is not None and not isinstance(row, MockRecord):
             return row
         return None
 
 
-class MockPool:
-    """Mock database pool."""
+class MockPool(MockConnection):
+    """Mock database pool; all state lives in MOCK_DATA, so it is its own connection."""
     def acquire(self):
         return self
 
     async def __aenter__(self):
-        return MockConnection()
+        return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         pass
@@ -174,39 +562,137 @@ class MockPool:
         pass
 
 
+def _encode_point(point) -> bytes:
+    """Encode a (lng, lat) tuple as a WGS84 EWKB point."""
+    lng, lat = point
+    return _EWKB_POINT.pack(1, _EWKB_POINT_TYPE, _SRID_WGS84, lng, lat)
+
+
+def _decode_point(data: bytes):
+    """Decode an EWKB point to (lng, lat); other shapes stay raw EWKB."""
+    if len(data) == _EWKB_POINT.size and data[0] == 1:
+        _, geom_type, _, lng, lat = _EWKB_POINT.unpack(data)
+        if geom_type == _EWKB_POINT_TYPE:
+            return lng, lat
+    return bytes(data)
+
+
+def _encode_json(value) -> str:
+    """Encode a jsonb value; strings that already hold JSON pass through."""
+    if isinstance(value, str):
+        try:
+            orjson.loads(value)
+            return value
+        except orjson.JSONDecodeError:
+            pass
+    return orjson.dumps(value).decode()
+
+
+async def _init_connection(conn) -> None:
+    """
+    Per-connection setup: exchange geography values as binary EWKB and
+    jsonb values as Python objects.
+    """
+    await conn.set_type_codec(
+        "geography",
+        schema=POSTGIS_SCHEMA,
+        encoder=_encode_point,
+        decoder=_decode_point,
+        format="binary"
+    )
+    await conn.set_type_codec(
+        "jsonb",
+        schema="pg_catalog",
+        encoder=_encode_json,
+        decoder=orjson.loads,
+        format="text"
+    )
+
+
 class DatabasePool:
     """Singleton database connection pool."""
     _pool: Optional[asyncpg.Pool] = None
+    _keepalive_task: Optional[asyncio.Task] = None
+    _init_lock = asyncio.Lock()
 
     @classmethod
     async def get_pool(cls):
         """Get or create the connection pool."""
+        pool = cls._pool
+        if pool is not None:
+            return pool
         if MOCK_DATABASE:
-            return MockPool()
-            
-        if cls._pool is None:
-            import ssl
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-
-            cls._pool = await asyncpg.create_pool(
-                DATABASE_URL,
-                min_size=2,
-                max_size=10,
-                ssl=ssl_context
-            )
+            cls._pool = MockPool()
+            return cls._pool
+
+        # Concurrent first requests wait for one pool instead of each creating one
+        async with cls._init_lock:
+            if cls._pool is None:
+                await cls._create_pool()
         return cls._pool
 
+    @classmethod
+    async def _create_pool(cls):
+        """Open the connection pool and start its background work."""
+        cls._pool = await asyncpg.create_pool(
+            DATABASE_URL,
+            min_size=DB_POOL_MIN,
+            max_size=DB_POOL_MAX,
+            max_inactive_connection_lifetime=DB_POOL_IDLE_TTL,
+            max_queries=100000,
+            command_timeout=DB_COMMAND_TIMEOUT,
+            statement_cache_size=1024,
+            # Short OLTP queries never amortize JIT compilation
+            server_settings={"jit": "off"},
+            ssl=SSL_CONTEXT,
+            init=_init_connection
+        )
+        cls._keepalive_task = asyncio.create_task(cls._keepalive())
+        if FRAUD_BLOOM_FILTER:
+            await _load_facility_bloom(cls._pool)
+
+    @classmethod
+    async def _keepalive(cls):
+        """Ping idle connections so server-side idle timeouts surface here, not on a request."""
+        while True:
+            await asyncio.sleep(POOL_KEEPALIVE_SECONDS)
+            pool = cls._pool
+            if pool is None:
+                return
+            try:
+                # Acquiring as many connections as are idle touches each of them once
+                idle = max(pool.get_idle_size(), 1)
+                await asyncio.gather(*(pool.execute("SELECT 1") for _ in range(idle)))
+            except Exception as e:
+                logger.warning(f"Database keepalive failed: {e}")
 
     @classmethod
     async def close(cls):
         """Close the connection pool."""
+        # Write queued reward records while the pool is still open
+        await _flush_reward_records()
+        if cls._keepalive_task:
+            cls._keepalive_task.cancel()
+            cls._keepalive_task = None
         if cls._pool:
             await cls._pool.close()
             cls._pool = None
 
 
+async def _load_facility_bloom(pool) -> None:
+    """Rebuild FACILITY_BLOOM from every facility in the database."""
+    try:
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT type, ST_GeoHash(ST_MakePoint(longitude, latitude), $1) as cell FROM facilities",
+                BLOOM_GEOHASH_PRECISION
+            )
+        FACILITY_BLOOM.rebuild((row["type"], row["cell"]) for row in rows)
+        logger.info(f"Loaded {len(rows)} facilities into bloom filter")
+    except Exception as e:
+        logger.error(f"Error loading facility bloom filter: {e}")
+
+
 async def save_facility(data: dict) -> str:
     """
     Save a new facility to the database.
@@ -217,7 +703,7 @@ async def save_facility(data: dict) -> str:
             - latitude: Latitude coordinate
             - longitude: Longitude coordinate
             - image_url: URL of uploaded image
-            - ai_analysis: JSON string of AI analysis results
+            - ai_analysis: AI analysis results (dict or JSON string)
             - contributor_address: Wallet address of contributor
 
     Returns:
@@ -225,25 +711,22 @@ async def save_facility(data: dict) -> str:
     """
     try:
         pool = await DatabasePool.get_pool()
-        facility_id = str(uuid.uuid4())
 
-        async with pool.acquire() as conn:
-            await conn.execute("""
-                INSERT INTO facilities (
-                    id, type, location, image_url,
-                    ai_analysis, contributor_address, created_at, updated_at
-                ) VALUES (
-                    $1, $2, ST_SetSRID(ST_MakePoint($3, $4), 4326),
-                    $5, $6, $7, NOW(), NOW()
-                )
-            """,
-                facility_id,
+        facility_id = await pool.fetchval(
+            SAVE_FACILITY_SQL,
+            data["type"],
+            (data["longitude"], data["latitude"]),
+            data["image_url"],
+            data.get("ai_analysis", {}),
+            data["contributor_address"]
+        )
+
+        facility_id = str(facility_id)
+        _invalidate_read_caches()
+        if FACILITY_BLOOM.ready:
+            FACILITY_BLOOM.add(
                 data["type"],
-                data["longitude"],
-                data["latitude"],
-                data["image_url"],
-                data.get("ai_analysis", "{}"),
-                data["contributor_address"]
+                geohash_encode(data["latitude"], data["longitude"], BLOOM_GEOHASH_PRECISION)
             )
 
         logger.info(f"Saved facility: {facility_id}")
@@ -254,12 +737,80 @@ async def save_facility(data: dict) -> str:
         raise
 
 
+async def save_facilities_bulk(rows: List[dict]) -> List[str]:
+    """
+    Save many facilities in a single transaction (e.g. imports).
+
+    Rows are COPY'd into a temporary staging table and inserted with one
+    INSERT ... SELECT, instead of one round trip per facility. Ids are
+    generated here rather than by the column default so they can be
+    returned in input order.
+
+    Args:
+        rows: List of facility dicts with the same keys as save_facility
+
+    Returns:
+        List of created facility UUIDs, in input order
+    """
+    if not rows:
+        return []
+
+    try:
+        pool = await DatabasePool.get_pool()
+        facility_ids = [str(uuid.uuid4()) for _ in rows]
+        records = [
+            (
+                facility_id,
+                row["type"],
+                row["longitude"],
+                row["latitude"],
+                row["image_url"],
+                _encode_json(row.get("ai_analysis", {})),
+                row["contributor_address"]
+            )
+            for facility_id, row in zip(facility_ids, rows)
+        ]
+
+        async with pool.acquire() as conn:
+            if MOCK_DATABASE:
+                facility_ids = [
+                    str(await conn.fetchval(
+                        SAVE_FACILITY_SQL, record[1], (record[2], record[3]), *record[4:]
+                    ))
+                    for record in records
+                ]
+            else:
+                async with conn.transaction():
+                    await conn.execute(FACILITY_STAGE_SQL)
+                    await conn.copy_records_to_table(
+                        "_facility_stage",
+                        records=records,
+                        columns=FACILITY_STAGE_COLUMNS
+                    )
+                    await conn.execute(INSERT_STAGED_FACILITIES_SQL)
+
+        _invalidate_read_caches()
+        if FACILITY_BLOOM.ready:
+            for row in rows:
+                FACILITY_BLOOM.add(
+                    row["type"],
+                    geohash_encode(row["latitude"], row["longitude"], BLOOM_GEOHASH_PRECISION)
+                )
+
+        logger.info(f"Saved {len(facility_ids)} facilities")
+        return facility_ids
+
+    except Exception as e:
+        logger.error(f"Error saving facilities: {e}")
+        raise
+
+
 async def check_existing(lat: float, lng: float, facility_type: str) -> dict:
     """
     Check if a similar facility exists at the given location.
 
     Uses PostGIS to find facilities within 50m of the coordinates
-    with the same type.
+    with the same type. Results are cached for READ_CACHE_TTL_SECONDS.
 
     Args:
         lat: Latitude coordinate
@@ -273,46 +824,74 @@ async def check_existing(lat: float, lng: float, facility_type: str) -> dict:
             - last_updated: When the facility was last updated
             - days_since_update: Days since last update
     """
+    # ~1m grid, matching the precision of the location hash
+    cache_key = (round(lat, 5), round(lng, 5), facility_type)
+    cached = _existing_cache.get(cache_key)
+    if cached is not None:
+        return dict(cached)
+
     try:
         pool = await DatabasePool.get_pool()
+        generation = _cache_generation
 
-        async with pool.acquire() as conn:
-            row = await conn.fetchrow("""
-                SELECT
-                    id, type,
-                    ST_X(location::geometry) as longitude,
-                    ST_Y(location::geometry) as latitude,
-                    image_url, ai_analysis, contributor_address,
-                    created_at, updated_at,
-                    EXTRACT(DAY FROM NOW() - updated_at) as days_since_update
-                FROM facilities
-                WHERE type = $1
-                AND ST_DWithin(
-                    location,
-                    ST_SetSRID(ST_MakePoint($2, $3), 4326)::geography,
-                    50  -- 50 meters radius
-                )
-                ORDER BY updated_at DESC
-                LIMIT 1
-            """, facility_type, lng, lat)
+        row = await pool.fetchrow(
+            CHECK_EXISTING_SQL, facility_type, (lng, lat),
+            *bounding_box(lat, lng, CHECK_EXISTING_RADIUS_METERS)
+        )
 
-        if row:
-            return {
-                "exists": True,
-                "facility": {
-                    "id": row["id"],
-                    "type": row["type"],
-                    "latitude": row["latitude"],
-                    "longitude": row["longitude"],
-                    "image_url": row["image_url"],
-                    "contributor_address": row["contributor_address"],
-                    "created_at": row["created_at"].isoformat() if row["created_at"] else None,
-                    "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None
-                },
-                "last_updated": row["updated_at"].isoformat() if row["updated_at"] else None,
-                "days_since_update": int(row["days_since_update"]) if row["days_since_update"] else 0
-            }
+        result = _existing_result(row)
+        if generation == _cache_generation:
+            _existing_cache[cache_key] = result
+        return dict(result)
+
+    except Exception as e:
+        logger.error(f"Error checking existing facility: {e}")
+        raise
 
+
+async def check_existing_bulk(probes: List[tuple]) -> List[dict]:
+    """
+    Check many (lat, lng, facility_type) probes for existing facilities.
+
+    All probes are answered by one query (unnest + LATERAL) instead of one
+    round trip each.
+
+    Args:
+        probes: List of (lat, lng, facility_type) tuples
+
+    Returns:
+        List of check_existing result dicts, in probe order
+    """
+    if not probes:
+        return []
+
+    if MOCK_DATABASE:
+        return [await check_existing(lat, lng, facility_type) for lat, lng, facility_type in probes]
+
+    try:
+        pool = await DatabasePool.get_pool()
+        lats, lngs, types = zip(*probes)
+        generation = _cache_generation
+
+        rows = await pool.fetch(CHECK_EXISTING_BULK_SQL, list(lats), list(lngs), list(types))
+
+        store = generation == _cache_generation
+        results = []
+        for (lat, lng, facility_type), row in zip(probes, rows):
+            result = _existing_result(row)
+            if store:
+                _existing_cache[(round(lat, 5), round(lng, 5), facility_type)] = result
+            results.append(dict(result))
+        return results
+
+    except Exception as e:
+        logger.error(f"Error checking existing facilities: {e}")
+        raise
+
+
+def _existing_result(row) -> dict:
+    """Build a check_existing result from a (possibly missing) facility row."""
+    if row is None or row["id"] is None:
         return {
             "exists": False,
             "facility": None,
@@ -320,74 +899,87 @@ async def check_existing(lat: float, lng: float, facility_type: str) -> dict:
             "days_since_update": None
         }
 
-    except Exception as e:
-        logger.error(f"Error checking existing facility: {e}")
-        raise
+    return {
+        "exists": True,
+        "facility": {
+            "id": row["id"],
+            "type": row["type"],
+            "latitude": row["latitude"],
+            "longitude": row["longitude"],
+            "image_url": row["image_url"],
+            "contributor_address": row["contributor_address"],
+            "created_at": row["created_at"].isoformat() if row["created_at"] else None,
+            "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None
+        },
+        "last_updated": row["updated_at"].isoformat() if row["updated_at"] else None,
+        "days_since_update": row["days_since_update"]
+    }
 
 
 async def query_facilities_nearby(
     lat: float,
     lng: float,
     radius: int = 200,
-    facility_type: Optional[str] = None
+    facility_type: Optional[str] = None,
+    limit: int = 100
 ) -> List[dict]:
     """
     Query facilities within a radius of the given coordinates.
 
+    Concurrent identical queries (e.g. several clients opening the map at
+    the same default location) share one database round trip, and results
+    are cached for READ_CACHE_TTL_SECONDS.
+
     Args:
         lat: Center latitude
         lng: Center longitude
         radius: Search radius in meters (default 200m)
         facility_type: Optional filter by type
+        limit: Maximum number of facilities, nearest first (default 100)
 
     Returns:
         List of facility dicts
     """
+    # ~1m grid, matching check_existing's cache
+    key = (round(lat, 5), round(lng, 5), radius, facility_type or None, limit)
+    facilities = _nearby_cache.get(key)
+    if facilities is None:
+        task = _nearby_queries.get(key)
+        if task is None:
+            task = asyncio.create_task(_query_nearby(*key))
+            _nearby_queries[key] = task
+            task.add_done_callback(lambda _: _nearby_queries.pop(key, None))
+        # Shield so one caller's cancellation doesn't cancel the shared query
+        facilities = await asyncio.shield(task)
+    return [dict(facility) for facility in facilities]
+
+
+# Nearby queries currently running, keyed like _nearby_cache
+_nearby_queries: Dict[tuple, asyncio.Task] = {}
+
+
+async def _query_nearby(
+    lat: float,
+    lng: float,
+    radius: int,
+    facility_type: Optional[str],
+    limit: int
+) -> List[dict]:
+    """Run the nearby query for this filter, build the facility dicts and cache them."""
     try:
         pool = await DatabasePool.get_pool()
+        generation = _cache_generation
 
-        async with pool.acquire() as conn:
-            if facility_type:
-                rows = await conn.fetch("""
-                    SELECT
-                        id, type,
-                        ST_X(location::geometry) as longitude,
-                        ST_Y(location::geometry) as latitude,
-                        ST_Distance(
-                            location,
-                            ST_SetSRID(ST_MakePoint($2, $1), 4326)::geography
-                        ) as distance,
-                        image_url, ai_analysis, contributor_address,
-                        created_at, updated_at
-                    FROM facilities
-                    WHERE type = $4
-                    AND ST_DWithin(
-                        location,
-                        ST_SetSRID(ST_MakePoint($2, $1), 4326)::geography,
-                        $3
-                    )
-                    ORDER BY distance
-                """, lat, lng, radius, facility_type)
-            else:
-                rows = await conn.fetch("""
-                    SELECT
-                        id, type,
-                        ST_X(location::geometry) as longitude,
-                        ST_Y(location::geometry) as latitude,
-                        ST_Distance(
-                            location,
-                            ST_SetSRID(ST_MakePoint($2, $1), 4326)::geography
-                        ) as distance,
-                        image_url, ai_analysis, contributor_address,
-                        created_at, updated_at
-                    FROM facilities
-                    WHERE ST_DWithin(
-                        location,
-                        ST_SetSRID(ST_MakePoint($2, $1), 4326)::geography,
-                        $3
-                    )
-                    ORDER BY distance
-                """, lat, lng, radius)
+        if facility_type:
+            rows = await pool.fetch(
+                NEARBY_FACILITIES_BY_TYPE_SQL, (lng, lat), radius, facility_type, limit,
+                *bounding_box(lat, lng, radius)
+            )
+        else:
+            rows = await pool.fetch(
+                NEARBY_FACILITIES_SQL, (lng, lat), radius, limit,
+                *bounding_box(lat, lng, radius)
+            )
 
         facilities = []
         for row in rows:
@@ -404,6 +996,8 @@ async def query_facilities_nearby(
                 "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None
             })
 
+        if generation == _cache_generation:
+            _nearby_cache[(lat, lng, radius, facility_type, limit)] = facilities
         logger.info(f"Found {len(facilities)} facilities within {radius}m")
         return facilities
 
@@ -426,29 +1020,14 @@ async def update_facility(facility_id: str, data: dict) -> bool:
     try:
         pool = await DatabasePool.get_pool()
 
-        # Build dynamic update query
-        updates = []
-        values = [facility_id]
-        param_idx = 2
-
-        if "image_url" in data:
-            updates.append(f"image_url = ${param_idx}")
-            values.append(data["image_url"])
-            param_idx += 1
+        await pool.execute(
+            UPDATE_FACILITY_SQL,
+            facility_id,
+            data.get("image_url"),
+            data.get("ai_analysis")
+        )
 
-        if "ai_analysis" in data:
-            updates.append(f"ai_analysis = ${param_idx}")
-            values.append(data["ai_analysis"])
-            param_idx += 1
-
-        updates.append("updated_at = NOW()")
-
-        async with pool.acquire() as conn:
-            await conn.execute(f"""
-                UPDATE facilities
-                SET {', '.join(updates)}
-                WHERE id = $1
-            """, *values)
+        _invalidate_read_caches(facility_id)
 
         logger.info(f"Updated facility: {facility_id}")
         return True
@@ -458,6 +1037,67 @@ async def update_facility(facility_id: str, data: dict) -> bool:
         return False
 
 
+async def submit_facility(
+    data: dict,
+    max_hourly: int,
+    max_daily: int,
+    radius_m: float,
+    window_days: int,
+    new_reward: int,
+    update_reward: int
+) -> dict:
+    """
+    Check a submission and save it in a single round trip (PostgreSQL only).
+
+    The facility is inserted, or the nearby facility it refreshes is
+    updated, only when the contributor is within the limits and the
+    submission is not a duplicate.
+
+    Args:
+        data: dict with the same keys as save_facility
+        max_hourly: Maximum submissions per contributor per hour
+        max_daily: Maximum submissions per contributor per day
+        radius_m: Radius within which a same-type facility is the same one
+        window_days: Days after an update during which resubmitting is a duplicate
+        new_reward: Reward for a new facility
+        update_reward: Reward for refreshing an existing facility
+
+    Returns:
+        dict with hourly_count, daily_count, is_fraud, reward_amount, reason,
+        existing_facility_id and facility_id (None when nothing was saved)
+    """
+    pool = await DatabasePool.get_pool()
+
+    row = await pool.fetchrow(
+        SUBMIT_FACILITY_SQL,
+        data["latitude"],
+        data["longitude"],
+        data["type"],
+        data["image_url"],
+        data.get("ai_analysis", {}),
+        data["contributor_address"],
+        max_hourly,
+        max_daily,
+        radius_m,
+        window_days,
+        new_reward,
+        update_reward
+    )
+    result = dict(row)
+
+    if result["facility_id"] is not None:
+        existing_id = result["existing_facility_id"]
+        _invalidate_read_caches(str(existing_id) if existing_id is not None else None)
+        if existing_id is None and FACILITY_BLOOM.ready:
+            FACILITY_BLOOM.add(
+                data["type"],
+                geohash_encode(data["latitude"], data["longitude"], BLOOM_GEOHASH_PRECISION)
+            )
+        logger.info(f"Saved submission: {result['facility_id']}")
+
+    return result
+
+
 async def save_reward(data: dict) -> str:
     """
     Save a reward record.
@@ -474,21 +1114,16 @@ async def save_reward(data: dict) -> str:
     """
     try:
         pool = await DatabasePool.get_pool()
-        reward_id = str(uuid.uuid4())
 
-        async with pool.acquire() as conn:
-            await conn.execute("""
-                INSERT INTO rewards (
-                    id, wallet_address, facility_id, amount, tx_hash, created_at
-                ) VALUES ($1, $2, $3, $4, $5, NOW())
-            """,
-                reward_id,
-                data["wallet_address"],
-                data["facility_id"],
-                data["amount"],
-                data.get("tx_hash")
-            )
+        reward_id = await pool.fetchval(
+            SAVE_REWARD_SQL,
+            data["wallet_address"],
+            data["facility_id"],
+            data["amount"],
+            data.get("tx_hash")
+        )
 
+        reward_id = str(reward_id)
         logger.info(f"Saved reward: {reward_id}")
         return reward_id
 
@@ -497,6 +1132,175 @@ async def save_reward(data: dict) -> str:
         raise
 
 
+async def save_rewards_bulk(rows: List[dict]) -> int:
+    """
+    Save many reward records (e.g. airdrops) with a single COPY.
+
+    Ids, reward_type and created_at come from the column defaults.
+
+    Args:
+        rows: List of reward dicts with the same keys as save_reward
+
+    Returns:
+        int: Number of reward records saved
+    """
+    if not rows:
+        return 0
+
+    try:
+        pool = await DatabasePool.get_pool()
+        records = [
+            (
+                row["wallet_address"],
+                row["facility_id"],
+                row["amount"],
+                row.get("tx_hash")
+            )
+            for row in rows
+        ]
+
+        async with pool.acquire() as conn:
+            if MOCK_DATABASE:
+                await conn.executemany(SAVE_REWARD_SQL, records)
+            else:
+                await conn.copy_records_to_table(
+                    "rewards",
+                    records=records,
+                    columns=REWARD_COPY_COLUMNS
+                )
+
+        logger.info(f"Saved {len(records)} rewards")
+        return len(records)
+
+    except Exception as e:
+        logger.error(f"Error saving rewards: {e}")
+        raise
+
+
+# Reward records waiting to be written by _flush_reward_records
+_pending_reward_records: List[dict] = []
+_reward_record_flush_task: Optional[asyncio.Task] = None
+# Flush tasks; the event loop only keeps weak references to tasks
+_reward_record_flushes: set = set()
+# Delay before the next retry, reset after a successful write
+_reward_record_retry_delay = REWARD_RECORD_RETRY_SECONDS
+# Errors caused by the record itself; retrying it can never succeed
+_REWARD_RECORD_DATA_ERRORS = (
+    asyncpg.DataError,
+    asyncpg.IntegrityConstraintViolationError,
+)
+
+
+def _schedule_reward_record_flush(delay: float = 0.0) -> asyncio.Task:
+    """Start a reward record flush and keep a reference until it is done."""
+    task = asyncio.create_task(_flush_reward_records(delay))
+    _reward_record_flushes.add(task)
+    task.add_done_callback(_reward_record_flushes.discard)
+    return task
+
+
+def _requeue_reward_records(rows: List[dict]) -> None:
+    """Put failed reward records back in the queue and retry with backoff."""
+    global _reward_record_flush_task, _reward_record_retry_delay
+    room = max(REWARD_RECORD_MAX_PENDING - len(_pending_reward_records), 0)
+    for row in rows[room:]:
+        logger.error(f"Dropped reward record, queue full: {row}")
+    _pending_reward_records[:0] = rows[:room]
+
+    if _reward_record_flush_task is None and _pending_reward_records:
+        _reward_record_flush_task = _schedule_reward_record_flush(
+            _reward_record_retry_delay
+        )
+    _reward_record_retry_delay = min(
+        _reward_record_retry_delay * 2, REWARD_RECORD_RETRY_MAX_SECONDS
+    )
+
+
+async def _flush_reward_records(delay: float = 0.0) -> None:
+    """Write every queued reward record with one COPY."""
+    global _reward_record_flush_task, _reward_record_retry_delay
+    if delay:
+        await asyncio.sleep(delay)
+
+    batch = _pending_reward_records[:]
+    _pending_reward_records.clear()
+    _reward_record_flush_task = None
+    if not batch:
+        return
+
+    failed = []
+    try:
+        await save_rewards_bulk(batch)
+    except _REWARD_RECORD_DATA_ERRORS:
+        # One bad row (e.g. a facility deleted meanwhile) fails the whole
+        # COPY; save the rows one by one so the others are kept
+        for row in batch:
+            try:
+                await save_reward(row)
+            except _REWARD_RECORD_DATA_ERRORS:
+                logger.exception(f"Dropped reward record: {row}")
+            except Exception:
+                failed.append(row)
+    except Exception:
+        # Database unreachable or similar; the rows carry tx_hashes of
+        # payouts already sent, so keep them for the next attempt
+        logger.exception(f"Error saving {len(batch)} reward records, will retry")
+        failed = batch
+
+    if failed:
+        _requeue_reward_records(failed)
+    else:
+        _reward_record_retry_delay = REWARD_RECORD_RETRY_SECONDS
+
+
+def queue_reward_record(data: dict) -> bool:
+    """
+    Queue a reward record to be saved in the background.
+
+    Records are batched into one COPY (see REWARD_RECORD_BATCH_MAX_SIZE).
+    Use save_reward when the new id is needed.
+
+    Args:
+        data: Reward data with the same keys as save_reward
+
+    Returns:
+        bool: False if the queue is full and the caller should save_reward
+    """
+    global _reward_record_flush_task
+    if len(_pending_reward_records) >= REWARD_RECORD_MAX_PENDING:
+        return False
+
+    _pending_reward_records.append(data)
+    if len(_pending_reward_records) >= REWARD_RECORD_BATCH_MAX_SIZE:
+        _schedule_reward_record_flush()
+    elif _reward_record_flush_task is None:
+        _reward_record_flush_task = _schedule_reward_record_flush(
+            REWARD_RECORD_WINDOW_SECONDS
+        )
+    return True
+
+
+async def get_total_rewards(wallet_address: str) -> int:
+    """
+    Get the total tokens a wallet has earned, without reading its rewards.
+
+    Args:
+        wallet_address: User's wallet address
+
+    Returns:
+        int: Total tokens earned (0 for a wallet without rewards)
+    """
+    try:
+        pool = await DatabasePool.get_pool()
+
+        total = await pool.fetchval(TOTAL_REWARDS_SQL, wallet_address)
+        return int(total or 0)
+
+    except Exception as e:
+        logger.error(f"Error getting total rewards: {e}")
+        raise
+
+
 async def get_user_rewards(wallet_address: str) -> dict:
     """
     Get all rewards for a wallet address.
@@ -510,22 +1314,9 @@ async def get_user_rewards(wallet_address: str) -> dict:
     try:
         pool = await DatabasePool.get_pool()
 
-        async with pool.acquire() as conn:
-            rows = await conn.fetch("""
-                SELECT
-                    r.id, r.facility_id, r.amount, r.tx_hash, r.created_at,
-                    f.type as facility_type
-                FROM rewards r
-                LEFT JOIN facilities f ON r.facility_id = f.id
-                WHERE r.wallet_address = $1
-                ORDER BY r.created_at DESC
-            """, wallet_address)
-
-            total = await conn.fetchval("""
-                SELECT COALESCE(SUM(amount), 0)
-                FROM rewards
-                WHERE wallet_address = $1
-            """, wallet_address)
+        rows = await pool.fetch(USER_REWARDS_SQL, wallet_address)
+
+        total = rows[0]["total_earned"] if rows else 0
 
         rewards = []
         for row in rows:
@@ -551,7 +1342,9 @@ async def get_user_rewards(wallet_address: str) -> dict:
 
 async def get_facility_by_id(facility_id: str) -> Optional[dict]:
     """
-    Get a facility by its ID.
+    Get a facility by its ID (cached for READ_CACHE_TTL_SECONDS).
+
+    Concurrent misses for the same id share one query.
 
     Args:
         facility_id: UUID of the facility
@@ -559,23 +1352,34 @@ async def get_facility_by_id(facility_id: str) -> Optional[dict]:
     Returns:
         dict with facility data or None if not found
     """
+    cached = _facility_cache.get(facility_id)
+    if cached is not None:
+        return dict(cached)
+
+    task = _facility_loads.get(facility_id)
+    if task is None:
+        task = asyncio.create_task(_load_facility(facility_id))
+        _facility_loads[facility_id] = task
+        task.add_done_callback(lambda _: _facility_loads.pop(facility_id, None))
+    # Shield so one caller's cancellation doesn't cancel the shared query
+    facility = await asyncio.shield(task)
+    return dict(facility) if facility is not None else None
+
+
+# Facility lookups currently querying the database, keyed by facility id
+_facility_loads: Dict[str, asyncio.Task] = {}
+
+
+async def _load_facility(facility_id: str) -> Optional[dict]:
+    """Fetch a facility row and store it in _facility_cache."""
     try:
         pool = await DatabasePool.get_pool()
+        generation = _cache_generation
 
-        async with pool.acquire() as conn:
-            row = await conn.fetchrow("""
-                SELECT
-                    id, type,
-                    ST_X(location::geometry) as longitude,
-                    ST_Y(location::geometry) as latitude,
-                    image_url, ai_analysis, contributor_address,
-                    created_at, updated_at
-                FROM facilities
-                WHERE id = $1
-            """, facility_id)
+        row = await pool.fetchrow(FACILITY_BY_ID_SQL, facility_id)
 
         if row:
-            return {
+            facility = {
                 "id": row["id"],
                 "type": row["type"],
                 "latitude": row["latitude"],
@@ -586,6 +1390,9 @@ async def get_facility_by_id(facility_id: str) -> Optional[dict]:
                 "created_at": row["created_at"].isoformat() if row["created_at"] else None,
                 "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None
             }
+            if generation == _cache_generation:
+                _facility_cache[facility_id] = facility
+            return facility
 
         return None
 
@@ -605,9 +1412,15 @@ def skill(name: str):
 
 # Register skills
 save_facility = skill("save_facility")(save_facility)
+save_facilities_bulk = skill("save_facilities_bulk")(save_facilities_bulk)
 check_existing = skill("check_existing")(check_existing)
+check_existing_bulk = skill("check_existing_bulk")(check_existing_bulk)
 query_facilities_nearby = skill("query_facilities_nearby")(query_facilities_nearby)
 update_facility = skill("update_facility")(update_facility)
+submit_facility = skill("submit_facility")(submit_facility)
 save_reward = skill("save_reward")(save_reward)
+save_rewards_bulk = skill("save_rewards_bulk")(save_rewards_bulk)
+queue_reward_record = skill("queue_reward_record")(queue_reward_record)
 get_user_rewards = skill("get_user_rewards")(get_user_rewards)
+get_total_rewards = skill("get_total_rewards")(get_total_rewards)
 get_facility_by_id = skill("get_facility_by_id")(get_facility_by_id)
@@ -1,4 +1,4 @@
 """Storage Skill - Google Cloud Storage for image uploads."""
-from .skill import upload_image, get_image_url, delete_image
+from .skill import upload_image, upload_image_stream, get_image_url, delete_image, delete_images
 
-__all__ = ["upload_image", "get_image_url", "delete_image"]
+__all__ = ["upload_image", "upload_image_stream", "get_image_url", "delete_image", "delete_images"]
@@ -8,17 +8,24 @@ Handles image storage operations:
 """
 
 import os
-import uuid
 import json
+import asyncio
+import shutil
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
-from typing import Optional
+from typing import BinaryIO, List, Optional
 
 from dotenv import load_dotenv
 load_dotenv()
 
+from cachetools import TLRUCache
+
+import google.auth
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import storage
 from google.oauth2 import service_account
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +37,39 @@ CREDENTIALS_JSON = os.getenv("GOOGLE_CREDENTIALS_JSON", "")  # JSON string for c
 MOCK_STORAGE = os.getenv("MOCK_STORAGE", "false").lower() == "true"
 UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
 
+# The GCS client is blocking; its calls run on their own threads so a slow
+# upload neither stalls the event loop nor starves other to_thread work
+GCS_UPLOAD_WORKERS = int(os.getenv("GCS_UPLOAD_WORKERS", "16"))
+# Per-request timeout; images (at most 10MB) go up in a single request
+GCS_UPLOAD_TIMEOUT_SECONDS = 30
+_gcs_executor = ThreadPoolExecutor(
+    max_workers=GCS_UPLOAD_WORKERS,
+    thread_name_prefix="gcs-upload"
+)
+
+# Keep-alive connections to storage.googleapis.com; requests defaults to 10,
+# fewer than the upload workers, and overflow opens a fresh TLS connection
+GCS_HTTP_POOL_SIZE = 64
+
+# Signed URLs by (blob_name, expiration_hours), reused for the first half of
+# their lifetime so a cached URL always has at least half its validity left
+_signed_url_cache: TLRUCache = TLRUCache(
+    maxsize=10_000,
+    ttu=lambda key, url, now: now + key[1] * 1800
+)
+
+
+def _http_session(credentials) -> AuthorizedSession:
+    """Authorized session with a connection pool of GCS_HTTP_POOL_SIZE."""
+    session = AuthorizedSession(credentials)
+    # No transport-level retries: the storage client already retries
+    # idempotent requests with backoff
+    session.mount("https://", HTTPAdapter(
+        pool_connections=GCS_HTTP_POOL_SIZE,
+        pool_maxsize=GCS_HTTP_POOL_SIZE
+    ))
+    return session
+
 
 class GCSClient:
     """Google Cloud Storage client singleton."""
@@ -48,11 +88,8 @@ class GCSClient:
                 try:
                     credentials_info = json.loads(CREDENTIALS_JSON)
                     credentials = service_account.Credentials.from_service_account_info(
-                        credentials_info
-                    )
-                    cls._client = storage.Client(
-                        project=GCS_PROJECT_ID,
-                        credentials=credentials
+                        credentials_info,
+                        scopes=storage.Client.SCOPE
                     )
                     logger.info("GCS client initialized from GOOGLE_CREDENTIALS_JSON")
                 except json.JSONDecodeError as e:
@@ -61,17 +98,20 @@ class GCSClient:
             # Try file path
             elif CREDENTIALS_PATH and os.path.exists(CREDENTIALS_PATH):
                 credentials = service_account.Credentials.from_service_account_file(
-                    CREDENTIALS_PATH
-                )
-                cls._client = storage.Client(
-                    project=GCS_PROJECT_ID,
-                    credentials=credentials
+                    CREDENTIALS_PATH,
+                    scopes=storage.Client.SCOPE
                 )
                 logger.info("GCS client initialized from file")
             else:
                 # Use default credentials (for Cloud Run, GCE, etc.)
-                cls._client = storage.Client(project=GCS_PROJECT_ID)
+                credentials, _ = google.auth.default(scopes=storage.Client.SCOPE)
                 logger.info("GCS client initialized with default credentials")
+
+            cls._client = storage.Client(
+                project=GCS_PROJECT_ID,
+                credentials=credentials,
+                _http=_http_session(credentials)
+            )
         return cls._client
 
     @classmethod
@@ -86,6 +126,69 @@ class GCSClient:
         return cls._bucket
 
 
+# File extension by content type; anything else is stored as .bin
+_EXT_BY_CONTENT_TYPE = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+    "image/heic": "heic",
+    "image/gif": "gif",
+}
+
+
+def _new_blob_name(facility_type: str, content_type: str) -> str:
+    """Unique blob name for a new image."""
+    extension = _EXT_BY_CONTENT_TYPE.get(content_type, "bin")
+    return f"facilities/{facility_type}/{os.urandom(16).hex()}.{extension}"
+
+
+def _write_local(file_path: str, image_data: bytes) -> None:
+    """Write an image to local storage (mock mode)."""
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, "wb") as f:
+        f.write(image_data)
+
+
+def _upload_blob(blob_name: str, image_data: bytes, content_type: str) -> None:
+    """Upload an image to the bucket (blocking)."""
+    # No chunk_size: objects up to 8MB go up as one multipart request instead
+    # of a resumable session (an extra round trip to open it)
+    blob = GCSClient.get_bucket().blob(blob_name, chunk_size=None)
+    # Blob names are fresh UUIDs, so "must not exist yet" always holds; the
+    # precondition makes the upload idempotent, which lets the client retry
+    # transient failures with exponential backoff
+    blob.upload_from_string(
+        image_data,
+        content_type=content_type,
+        if_generation_match=0,
+        timeout=GCS_UPLOAD_TIMEOUT_SECONDS
+    )
+
+
+def _write_local_stream(file_path: str, fileobj: BinaryIO) -> None:
+    """Copy an image stream to local storage (mock mode)."""
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, "wb") as f:
+        shutil.copyfileobj(fileobj, f)
+
+
+def _upload_blob_stream(
+    blob_name: str,
+    fileobj: BinaryIO,
+    size: int,
+    content_type: str
+) -> None:
+    """Upload an image from a file object to the bucket (blocking)."""
+    blob = GCSClient.get_bucket().blob(blob_name, chunk_size=None)
+    blob.upload_from_file(
+        fileobj,
+        size=size,
+        content_type=content_type,
+        if_generation_match=0,
+        timeout=GCS_UPLOAD_TIMEOUT_SECONDS
+    )
+
+
 async def upload_image(
     image_data: bytes,
     facility_type: str,
@@ -106,22 +209,15 @@ async def upload_image(
         - blob_name: Name of the blob in GCS
     """
     try:
-        # Generate unique filename
-        file_id = str(uuid.uuid4())
-        extension = "jpg" if "jpeg" in content_type else content_type.split("/")[-1]
-        
+        blob_name = _new_blob_name(facility_type, content_type)
+
         if MOCK_STORAGE:
-            # Local storage logic
-            blob_name = f"facilities/{facility_type}/{file_id}.{extension}"
-            
-            # Ensure directory exists
-            os.makedirs(os.path.join(UPLOAD_DIR, "facilities", facility_type), exist_ok=True)
-            
-            # Write file
+            # Local storage logic: write file
             file_path = os.path.join(UPLOAD_DIR, blob_name)
-            with open(file_path, "wb") as f:
-                f.write(image_data)
-                
+            await asyncio.get_running_loop().run_in_executor(
+                _gcs_executor, _write_local, file_path, image_data
+            )
+
             # Construct local URL (assuming backend serves uploads)
             # This requires backend to mount static files
             api_url = os.getenv("NEXT_PUBLIC_API_URL", "http://localhost:8000")
@@ -134,21 +230,15 @@ async def upload_image(
                 "url": url,
                 "blob_name": blob_name
             }
-        
-        bucket = GCSClient.get_bucket()
-
-        blob_name = f"facilities/{facility_type}/{file_id}.{extension}"
 
-        # Create blob and upload
-        blob = bucket.blob(blob_name)
-        blob.upload_from_string(
-            image_data,
-            content_type=content_type
+        await asyncio.get_running_loop().run_in_executor(
+            _gcs_executor, _upload_blob, blob_name, image_data, content_type
         )
 
-        # Use direct public URL (bucket should have allUsers read access)
-        # Note: make_public() doesn't work with uniform bucket-level access
-        url = f"https://storage.googleapis.com/{GCS_BUCKET_NAME}/{blob_name}"
+        # No per-object ACL call: the bucket uses uniform bucket-level access
+        # with public read, granted once with
+        #   gsutil iam ch allUsers:objectViewer gs://$GCS_BUCKET_NAME
+        url = get_public_url(blob_name)
 
         logger.info(f"Image uploaded: {blob_name}")
 
@@ -168,10 +258,71 @@ async def upload_image(
         }
 
 
+async def upload_image_stream(
+    fileobj: BinaryIO,
+    size: int,
+    facility_type: str,
+    content_type: str = "image/jpeg"
+) -> dict:
+    """
+    Upload an image to Google Cloud Storage from a file object.
+
+    The image is read from fileobj (e.g. UploadFile.file, a spooled temp
+    file) as it is sent, so it never has to be held in memory as bytes.
+
+    Args:
+        fileobj: Readable binary file positioned at the start of the image
+        size: Image size in bytes
+        facility_type: Type of facility (for organizing in folders)
+        content_type: MIME type of the image
+
+    Returns:
+        dict with:
+        - success: Whether upload succeeded
+        - url: Public URL of the uploaded image
+        - blob_name: Name of the blob in GCS
+    """
+    try:
+        blob_name = _new_blob_name(facility_type, content_type)
+        loop = asyncio.get_running_loop()
+
+        if MOCK_STORAGE:
+            file_path = os.path.join(UPLOAD_DIR, blob_name)
+            await loop.run_in_executor(
+                _gcs_executor, _write_local_stream, file_path, fileobj
+            )
+            api_url = os.getenv("NEXT_PUBLIC_API_URL", "http://localhost:8000")
+            url = f"{api_url}/uploads/{blob_name}"
+            logger.info(f"Image saved locally: {file_path}")
+        else:
+            await loop.run_in_executor(
+                _gcs_executor, _upload_blob_stream, blob_name, fileobj, size, content_type
+            )
+            url = get_public_url(blob_name)
+            logger.info(f"Image uploaded: {blob_name}")
+
+        return {
+            "success": True,
+            "url": url,
+            "blob_name": blob_name
+        }
+
+    except Exception as e:
+        logger.error(f"Failed to upload image: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "url": None,
+            "blob_name": None
+        }
+
+
 async def get_image_url(blob_name: str, expiration_hours: int = 24) -> Optional[str]:
     """
     Get a signed URL for an image (for private buckets).
 
+    URLs are cached for half of expiration_hours.
+
     Args:
         blob_name: Name of the blob in GCS
         expiration_hours: URL expiration time in hours
@@ -179,16 +330,24 @@ async def get_image_url(blob_name: str, expiration_hours: int = 24) -> Optional[
     Returns:
         Signed URL or None if failed
     """
+    key = (blob_name, expiration_hours)
+    url = _signed_url_cache.get(key)
+    if url is not None:
+        return url
+
     try:
         bucket = GCSClient.get_bucket()
         blob = bucket.blob(blob_name)
 
-        url = blob.generate_signed_url(
+        # Signing is an RSA operation, or an IAM API call without a key file
+        url = await asyncio.to_thread(
+            blob.generate_signed_url,
             version="v4",
             expiration=timedelta(hours=expiration_hours),
             method="GET"
         )
 
+        _signed_url_cache[key] = url
         return url
 
     except Exception as e:
@@ -196,6 +355,20 @@ async def get_image_url(blob_name: str, expiration_hours: int = 24) -> Optional[
         return None
 
 
+# Calls per GCS JSON batch request (the API's limit)
+GCS_BATCH_SIZE = 100
+
+
+def _delete_blobs(blob_names: List[str]) -> None:
+    """Delete blobs, up to GCS_BATCH_SIZE per HTTP request (blocking)."""
+    client = GCSClient.get_client()
+    bucket = GCSClient.get_bucket()
+    for start in range(0, len(blob_names), GCS_BATCH_SIZE):
+        with client.batch():
+            for blob_name in blob_names[start:start + GCS_BATCH_SIZE]:
+                bucket.blob(blob_name).delete()
+
+
 async def delete_image(blob_name: str) -> bool:
     """
     Delete an image from GCS.
@@ -206,16 +379,32 @@ async def delete_image(blob_name: str) -> bool:
     Returns:
         True if deleted, False otherwise
     """
+    return await delete_images([blob_name])
+
+
+async def delete_images(blob_names: List[str]) -> bool:
+    """
+    Delete many images from GCS using batch requests.
+
+    Args:
+        blob_names: Names of the blobs to delete
+
+    Returns:
+        True if all were deleted, False otherwise
+    """
+    if not blob_names:
+        return True
+
     try:
-        bucket = GCSClient.get_bucket()
-        blob = bucket.blob(blob_name)
-        blob.delete()
+        await asyncio.get_running_loop().run_in_executor(
+            _gcs_executor, _delete_blobs, list(blob_names)
+        )
 
-        logger.info(f"Image deleted: {blob_name}")
+        logger.info(f"Images deleted: {len(blob_names)}")
         return True
 
     except Exception as e:
-        logger.error(f"Failed to delete image: {e}")
+        logger.error(f"Failed to delete images: {e}")
         return False
 
 
@@ -243,5 +432,7 @@ def skill(name: str):
 
 # Register skills
 upload_image = skill("upload_image")(upload_image)
+upload_image_stream = skill("upload_image_stream")(upload_image_stream)
 get_image_url = skill("get_image_url")(get_image_url)
 delete_image = skill("delete_image")(delete_image)
+delete_images = skill("delete_images")(delete_images)
@@ -1,4 +1,9 @@
 """Vision Skill - Image recognition for accessibility facilities."""
-from .skill import analyze_image, validate_image_quality
+from .skill import analyze_image, validate_image_quality, normalize_image, start_image_analysis
 
-__all__ = ["analyze_image", "validate_image_quality"]
+__all__ = [
+    "analyze_image",
+    "validate_image_quality",
+    "normalize_image",
+    "start_image_analysis"
+]
@@ -5,16 +5,31 @@ Uses Gemini Vision API through SpoonOS to analyze uploaded images
 and identify accessibility facility types and conditions.
 """
 
-import base64
-import json
+import io
+import os
+import random
+import asyncio
 import logging
-from typing import Optional
+import functools
+import hashlib
+from typing import Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+load_dotenv()
 
 import google.generativeai as genai
+import orjson
+from cachetools import TTLCache
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
 
+# Configuration
+MOCK_VISION = os.getenv("MOCK_VISION", "false").lower() == "true"
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+GEMINI_PROXY = os.getenv("HTTPS_PROXY") or os.getenv("HTTP_PROXY")
+
 
 class VisionAnalysisResult(BaseModel):
     """Result of image analysis."""
@@ -44,6 +59,161 @@ FACILITY_TYPES = {
         "description": "Wheelchair rental/lending station"
     }
 }
+_FACILITY_TYPE_SET = frozenset(FACILITY_TYPES)
+
+
+# Analysis prompt sent with every image
+_PROMPT = """
+Analyze this image and determine if it shows an accessibility facility.
+
+Accessibility facilities include:
+1. Wheelchair ramps (坡道) - sloped surfaces for wheelchair access
+2. Accessible toilets (无障碍厕所) - restrooms with accessibility features
+3. Accessible elevators (无障碍电梯) - elevators with accessibility features
+4. Wheelchair stations (轮椅借用处) - places to borrow wheelchairs
+
+Please respond in JSON format with:
+{
+    "is_valid": true/false,
+    "facility_type": "ramp" | "toilet" | "elevator" | "wheelchair" | null,
+    "condition": "description of facility condition in Chinese",
+    "confidence": 0.0-1.0,
+    "details": {
+        "accessibility_features": ["list of observed features"],
+        "potential_issues": ["any issues that might affect usability"],
+        "recommendations": ["suggestions for improvement if any"]
+    }
+}
+
+If the image does not show an accessibility facility, set is_valid to false
+and explain why in the condition field.
+"""
+
+# Mock analyses returned when MOCK_VISION is set, one per facility type.
+# Only the top level is copied per call; details is shared and read-only.
+_MOCK_RESULTS = tuple(
+    {
+        "is_valid": True,
+        "facility_type": facility_type,
+        "condition": "设施状况良好，可正常使用",
+        "confidence": 0.95,
+        "details": {
+            "accessibility_features": ["无障碍标识清晰", "通道宽敞"],
+            "potential_issues": [],
+            "recommendations": []
+        }
+    }
+    for facility_type in FACILITY_TYPES
+)
+
+# Ask Gemini for a bare JSON body instead of prose or a fenced code block
+JSON_RESPONSE_CONFIG = genai.GenerationConfig(response_mime_type="application/json")
+
+# Seconds to wait for one Gemini response before retrying
+GEMINI_TIMEOUT_SECONDS = 60
+
+# Parsed analyses by (model, sha256 of the image), so a retried upload of
+# the same photo skips the Gemini round trip. Keyed on the model so a model
+# change never serves an old answer. Only successful parses are stored.
+ANALYSIS_CACHE_TTL_SECONDS = 24 * 60 * 60
+_analysis_cache: TTLCache = TTLCache(maxsize=1024, ttl=ANALYSIS_CACHE_TTL_SECONDS)
+
+# Uploads larger than this (bytes or pixels on the long side) are downscaled
+# and re-encoded as JPEG before storage and analysis
+NORMALIZE_MAX_BYTES = 1_500_000
+NORMALIZE_MAX_DIMENSION = 2048
+NORMALIZE_JPEG_QUALITY = 85
+
+
+def _normalize_image(image: bytes) -> Optional[bytes]:
+    """Downscale and re-encode an oversized image; None if already small."""
+    from PIL import Image, ImageOps
+
+    img = Image.open(io.BytesIO(image))
+    if len(image) <= NORMALIZE_MAX_BYTES and max(img.size) <= NORMALIZE_MAX_DIMENSION:
+        return None
+
+    # For JPEGs, let libjpeg decode at 1/2, 1/4 or 1/8 scale in the DCT
+    # domain while staying at least the target size; a no-op for other
+    # formats. Must precede exif_transpose, which loads the pixels.
+    img.draft("RGB", (NORMALIZE_MAX_DIMENSION, NORMALIZE_MAX_DIMENSION))
+
+    # Apply the EXIF rotation before the tag is dropped by re-encoding
+    img = ImageOps.exif_transpose(img)
+    img.thumbnail((NORMALIZE_MAX_DIMENSION, NORMALIZE_MAX_DIMENSION), Image.LANCZOS)
+    buf = io.BytesIO()
+    img.convert("RGB").save(
+        buf, "JPEG", quality=NORMALIZE_JPEG_QUALITY, optimize=True, progressive=True
+    )
+    return buf.getvalue()
+
+
+def _image_mime_type(image: bytes) -> str:
+    """MIME type of an accepted upload format, from its magic bytes."""
+    if image.startswith(b"\x89PNG"):
+        return "image/png"
+    if image[:4] == b"RIFF" and image[8:12] == b"WEBP":
+        return "image/webp"
+    return "image/jpeg"
+
+
+async def normalize_image(image: bytes, content_type: str) -> Tuple[bytes, str]:
+    """
+    Shrink an oversized upload before it is stored and analyzed.
+
+    Images over NORMALIZE_MAX_BYTES or NORMALIZE_MAX_DIMENSION pixels are
+    downscaled and re-encoded as JPEG; others are returned unchanged.
+
+    Args:
+        image: Raw image bytes
+        content_type: MIME type of the image
+
+    Returns:
+        (image bytes, content type) to use from here on
+    """
+    try:
+        normalized = await asyncio.to_thread(_normalize_image, image)
+    except Exception as e:
+        logger.warning(f"Image normalization failed, keeping original: {e}")
+        return image, content_type
+
+    if normalized is None:
+        return image, content_type
+    logger.info(f"Image normalized: {len(image)} -> {len(normalized)} bytes")
+    return normalized, "image/jpeg"
+
+
+@functools.lru_cache(maxsize=1)
+def _get_model() -> genai.GenerativeModel:
+    """Configure the Gemini client and build the model, once per process."""
+    # Configure proxy for Gemini API access (needed in regions with restrictions)
+    if GEMINI_PROXY:
+        # Set environment variables for underlying HTTP libraries
+        os.environ["HTTP_PROXY"] = GEMINI_PROXY
+        os.environ["HTTPS_PROXY"] = GEMINI_PROXY
+        os.environ["GRPC_PROXY"] = GEMINI_PROXY
+        logger.info(f"Using proxy for Gemini API: {GEMINI_PROXY}")
+
+    # Configure Gemini API key
+    if GEMINI_API_KEY:
+        # WORKAROUND: Disable SSL verification for Hackathon/Proxy env
+        import ssl
+        import urllib3
+        urllib3.disable_warnings()
+        try:
+            _create_unverified_https_context = ssl._create_unverified_context
+        except AttributeError:
+            pass
+        else:
+            ssl._create_default_https_context = _create_unverified_https_context
+
+        genai.configure(api_key=GEMINI_API_KEY, transport="rest")
+    else:
+        logger.warning("GEMINI_API_KEY not set, using default credentials")
+
+    # Configure Gemini (use 2.5-flash, 1.5 series has been retired)
+    logger.info(f"Using Gemini model: {GEMINI_MODEL}")
+    return genai.GenerativeModel(GEMINI_MODEL)
 
 
 async def analyze_image(image: bytes) -> dict:
@@ -56,6 +226,8 @@ async def analyze_image(image: bytes) -> dict:
     3. Assess the facility condition
     4. Extract relevant details
 
+    Concurrent calls for the same image share one Gemini request.
+
     Args:
         image: Raw image bytes
 
@@ -67,133 +239,106 @@ async def analyze_image(image: bytes) -> dict:
         - confidence: Confidence score (0-1)
         - details: Additional extracted information
     """
-    import os
-    import random
-
     # Mock mode for testing when Gemini API is not available
-    if os.getenv("MOCK_VISION", "false").lower() == "true":
-        facility_types = ["ramp", "toilet", "elevator", "wheelchair"]
-        selected_type = random.choice(facility_types)
-        logger.info(f"[MOCK MODE] Returning mock analysis: {selected_type}")
-        return {
-            "is_valid": True,
-            "facility_type": selected_type,
-            "condition": "设施状况良好，可正常使用",
-            "confidence": 0.95,
-            "details": {
-                "accessibility_features": ["无障碍标识清晰", "通道宽敞"],
-                "potential_issues": [],
-                "recommendations": []
-            }
-        }
+    if MOCK_VISION:
+        result = dict(random.choice(_MOCK_RESULTS))
+        logger.info(f"[MOCK MODE] Returning mock analysis: {result['facility_type']}")
+        return result
+
+    cache_key = (GEMINI_MODEL, hashlib.sha256(image).digest())
+    cached = _analysis_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"Vision analysis cache hit: type={cached.get('facility_type')}")
+        return dict(cached)
+
+    # Shield so one caller's cancellation doesn't cancel the shared request
+    result = await asyncio.shield(_analysis_task(image, cache_key))
+    return dict(result)
+
+
+def start_image_analysis(image: bytes) -> None:
+    """
+    Start analyzing an image in the background.
+
+    A later analyze_image call for the same bytes (e.g. from the agent's
+    vision tool) joins the running request instead of starting another,
+    so the Gemini call can overlap other upload work such as storage.
+
+    Args:
+        image: Raw image bytes
+    """
+    if MOCK_VISION:
+        return
+    cache_key = (GEMINI_MODEL, hashlib.sha256(image).digest())
+    if cache_key not in _analysis_cache:
+        _analysis_task(image, cache_key)
+
+
+# Gemini requests currently running, keyed like _analysis_cache
+_analyses: Dict[tuple, asyncio.Task] = {}
+
+
+def _analysis_task(image: bytes, cache_key: tuple) -> asyncio.Task:
+    """The running analysis of this image, started if there is none."""
+    task = _analyses.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(_analyze(image, cache_key))
+        _analyses[cache_key] = task
+        task.add_done_callback(lambda _: _analyses.pop(cache_key, None))
+    return task
 
-    try:
-        # Configure proxy for Gemini API access (needed in regions with restrictions)
-        proxy = os.getenv("HTTPS_PROXY") or os.getenv("HTTP_PROXY")
-        if proxy:
-            # Set environment variables for underlying HTTP libraries
-            os.environ["HTTP_PROXY"] = proxy
-            os.environ["HTTPS_PROXY"] = proxy
-            os.environ["GRPC_PROXY"] = proxy
-            logger.info(f"Using proxy for Gemini API: {proxy}")
-
-        # Configure Gemini API key
-        api_key = os.getenv("GEMINI_API_KEY")
-        if api_key:
-            # WORKAROUND: Disable SSL verification for Hackathon/Proxy env
-            import ssl
-            import urllib3
-            urllib3.disable_warnings()
-            try:
-                _create_unverified_https_context = ssl._create_unverified_context
-            except AttributeError:
-                pass
-            else:
-                ssl._create_default_https_context = _create_unverified_https_context
-            
-            genai.configure(api_key=api_key, transport="rest")
-        else:
-            logger.warning("GEMINI_API_KEY not set, using default credentials")
-
-        # Configure Gemini (use 2.5-flash, 1.5 series has been retired)
-        model_name = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
-        model = genai.GenerativeModel(model_name)
-        logger.info(f"Using Gemini model: {model_name}")
-
-        # Encode image for API
-        image_data = base64.b64encode(image).decode('utf-8')
-
-        # Create analysis prompt
-        prompt = """
-        Analyze this image and determine if it shows an accessibility facility.
-
-        Accessibility facilities include:
-        1. Wheelchair ramps (坡道) - sloped surfaces for wheelchair access
-        2. Accessible toilets (无障碍厕所) - restrooms with accessibility features
-        3. Accessible elevators (无障碍电梯) - elevators with accessibility features
-        4. Wheelchair stations (轮椅借用处) - places to borrow wheelchairs
-
-        Please respond in JSON format with:
-        {
-            "is_valid": true/false,
-            "facility_type": "ramp" | "toilet" | "elevator" | "wheelchair" | null,
-            "condition": "description of facility condition in Chinese",
-            "confidence": 0.0-1.0,
-            "details": {
-                "accessibility_features": ["list of observed features"],
-                "potential_issues": ["any issues that might affect usability"],
-                "recommendations": ["suggestions for improvement if any"]
-            }
-        }
 
-        If the image does not show an accessibility facility, set is_valid to false
-        and explain why in the condition field.
-        """
+async def _analyze(image: bytes, cache_key: tuple) -> dict:
+    """Call Gemini for one image and parse the result; never raises."""
+    try:
+        model = _get_model()
 
-        # Call Gemini Vision API with retry for rate limits
-        import time
+        # Call Gemini Vision API with retry for rate limits and timeouts.
+        # The SDK call blocks (REST transport), so it runs in a worker thread.
         max_retries = 3
         retry_delay = 5  # seconds
 
         for attempt in range(max_retries):
             try:
-                response = model.generate_content([
-                    prompt,
-                    {"mime_type": "image/jpeg", "data": image_data}
-                ])
+                response = await asyncio.wait_for(
+                    asyncio.to_thread(model.generate_content, [
+                        _PROMPT,
+                        {"mime_type": _image_mime_type(image), "data": image}
+                    ], generation_config=JSON_RESPONSE_CONFIG),
+                    timeout=GEMINI_TIMEOUT_SECONDS
+                )
                 break  # Success, exit retry loop
             except Exception as e:
                 error_str = str(e).lower()
-                if "429" in error_str or "resource exhausted" in error_str or "quota" in error_str:
-                    if attempt < max_retries - 1:
-                        wait_time = retry_delay * (attempt + 1)
-                        logger.warning(f"Rate limited, waiting {wait_time}s before retry {attempt + 2}/{max_retries}")
-                        time.sleep(wait_time)
-                        continue
-                raise  # Re-raise if not rate limit or last attempt
-
-        # Parse response
-        response_text = response.text
-
-        # Extract JSON from response (handle markdown code blocks)
-        if "```json" in response_text:
-            response_text = response_text.split("```json")[1].split("```")[0]
-        elif "```" in response_text:
-            response_text = response_text.split("```")[1].split("```")[0]
-
-        result = json.loads(response_text.strip())
+                retryable = isinstance(e, asyncio.TimeoutError) or (
+                    "429" in error_str or "resource exhausted" in error_str or "quota" in error_str
+                )
+                if retryable and attempt < max_retries - 1:
+                    wait_time = retry_delay * (attempt + 1)
+                    logger.warning(
+                        f"Gemini call failed ({type(e).__name__}), waiting {wait_time}s "
+                        f"before retry {attempt + 2}/{max_retries}"
+                    )
+                    await asyncio.sleep(wait_time)
+                    continue
+                raise  # Re-raise if not retryable or last attempt
+
+        # Parse response (JSON mode, so no markdown fences to strip)
+        result = orjson.loads(response.text)
 
         # Validate facility type
-        if result.get("facility_type") and result["facility_type"] not in FACILITY_TYPES:
+        ft = result.get("facility_type")
+        if ft and ft not in _FACILITY_TYPE_SET:
             result["facility_type"] = None
             result["is_valid"] = False
             result["condition"] = "Unrecognized facility type"
 
         logger.info(f"Vision analysis complete: valid={result.get('is_valid')}, type={result.get('facility_type')}")
 
+        _analysis_cache[cache_key] = result
         return result
 
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Failed to parse Gemini response: {e}")
         return {
             "is_valid": False,
@@ -231,10 +376,19 @@ async def validate_image_quality(image: bytes) -> dict:
     """
     try:
         from PIL import Image
-        import io
 
-        img = Image.open(io.BytesIO(image))
-        width, height = img.size
+        # Check maximum file size (10MB) before handing the bytes to Pillow
+        max_size = 10 * 1024 * 1024
+        if len(image) > max_size:
+            return {
+                "is_acceptable": False,
+                "reason": "Image file too large. Maximum 10MB allowed.",
+                "size_bytes": len(image)
+            }
+
+        # Image.open only parses the header; size needs no pixel decode
+        with Image.open(io.BytesIO(image)) as img:
+            width, height = img.size
 
         # Check minimum dimensions
         min_dimension = 200
@@ -246,15 +400,6 @@ async def validate_image_quality(image: bytes) -> dict:
                 "height": height
             }
 
-        # Check maximum file size (10MB)
-        max_size = 10 * 1024 * 1024
-        if len(image) > max_size:
-            return {
-                "is_acceptable": False,
-                "reason": "Image file too large. Maximum 10MB allowed.",
-                "size_bytes": len(image)
-            }
-
         return {
             "is_acceptable": True,
             "width": width,
@@ -282,3 +427,4 @@ def skill(name: str):
 # Register skills
 analyze_image = skill("analyze_image")(analyze_image)
 validate_image_quality = skill("validate_image_quality")(validate_image_quality)
+normalize_image = skill("normalize_image")(normalize_image)
@@ -5,27 +5,32 @@ This module contains tools using BaseTool class pattern
 for use with the SpoonOS ReAct Agent.
 """
 
-from tools.vision_tool import VisionAnalyzeTool, VisionValidateQualityTool
-from tools.anti_fraud_tool import (
-    AntiFraudCheckTool,
-    AntiFraudRateCheckTool,
-    AntiFraudLocationCheckTool,
-    AntiFraudStatisticsTool,
-)
-from tools.database_tool import (
-    DatabaseSaveFacilityTool,
-    DatabaseUpdateFacilityTool,
-    DatabaseQueryFacilitiesTool,
-    DatabaseSaveRewardTool,
-    DatabaseGetUserRewardsTool,
-    DatabaseGetFacilityTool,
-    DatabaseCheckExistingTool,
-)
-from tools.blockchain_tool import (
-    BlockchainRewardTool,
-    BlockchainBalanceTool,
-    BlockchainCheckVerificationTool,
-)
+import importlib
+
+# Tool class -> defining module; each module (and the SDKs it pulls in)
+# is imported only when one of its tools is first accessed
+_LAZY = {
+    "VisionAnalyzeTool": "tools.vision_tool",
+    "VisionValidateQualityTool": "tools.vision_tool",
+    "AntiFraudCheckTool": "tools.anti_fraud_tool",
+    "AntiFraudRateCheckTool": "tools.anti_fraud_tool",
+    "AntiFraudLocationCheckTool": "tools.anti_fraud_tool",
+    "AntiFraudCombinedCheckTool": "tools.anti_fraud_tool",
+    "AntiFraudStatisticsTool": "tools.anti_fraud_tool",
+    "DatabaseSaveFacilityTool": "tools.database_tool",
+    "DatabaseSaveFacilitiesBulkTool": "tools.database_tool",
+    "DatabaseUpdateFacilityTool": "tools.database_tool",
+    "DatabaseQueryFacilitiesTool": "tools.database_tool",
+    "DatabaseSaveRewardTool": "tools.database_tool",
+    "DatabaseGetUserRewardsTool": "tools.database_tool",
+    "DatabaseGetFacilityTool": "tools.database_tool",
+    "DatabaseCheckExistingTool": "tools.database_tool",
+    "BlockchainRewardTool": "tools.blockchain_tool",
+    "BlockchainBatchRewardTool": "tools.blockchain_tool",
+    "BlockchainBalanceTool": "tools.blockchain_tool",
+    "BlockchainCheckVerificationTool": "tools.blockchain_tool",
+    "ContributionPipelineTool": "tools.pipeline_tool",
+}
 
 __all__ = [
     # Vision tools
@@ -35,9 +40,11 @@ __all__ = [
     "AntiFraudCheckTool",
     "AntiFraudRateCheckTool",
     "AntiFraudLocationCheckTool",
+    "AntiFraudCombinedCheckTool",
     "AntiFraudStatisticsTool",
     # Database tools
     "DatabaseSaveFacilityTool",
+    "DatabaseSaveFacilitiesBulkTool",
     "DatabaseUpdateFacilityTool",
     "DatabaseQueryFacilitiesTool",
     "DatabaseSaveRewardTool",
@@ -46,6 +53,18 @@ __all__ = [
     "DatabaseCheckExistingTool",
     # Blockchain tools
     "BlockchainRewardTool",
+    "BlockchainBatchRewardTool",
     "BlockchainBalanceTool",
     "BlockchainCheckVerificationTool",
+    # Pipeline tools
+    "ContributionPipelineTool",
 ]
+
+
+def __getattr__(name: str):
+    """Import a tool's module on first access (PEP 562)."""
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name]), name)
+    globals()[name] = value
+    return value
@@ -4,11 +4,19 @@ Anti-Fraud Tool - Duplicate and fraud detection
 SpoonOS tool using BaseTool class for the anti-fraud skill.
 """
 
+import asyncio
 import logging
 from typing import Any, Optional
 
 from spoon_ai.tools import BaseTool
 
+from skills.anti_fraud.skill import (
+    check_fraud as _check_fraud,
+    check_user_submission_rate as _check_rate,
+    check_location_validity as _check_location,
+    get_fraud_statistics as _get_stats
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -62,15 +70,13 @@ Rules:
             - reason: Explanation of the determination
             - existing_facility_id: ID of existing facility if found
         """
-        from skills.anti_fraud.skill import check_fraud as _check_fraud
-
         try:
             result = await _check_fraud(latitude, longitude, facility_type)
-            logger.info(f"Fraud check: is_fraud={result.get('is_fraud')}, reason={result.get('reason')}")
+            logger.info("Fraud check: is_fraud=%s, reason=%s", result.get('is_fraud'), result.get('reason'))
             return result
 
         except Exception as e:
-            logger.error(f"Fraud check error: {e}")
+            logger.error("Fraud check error: %s", e)
             # Default to new facility on error to not block legitimate submissions
             return {
                 "is_fraud": False,
@@ -114,14 +120,12 @@ Rate limits: Max 10 submissions per hour, max 50 submissions per day."""
             - remaining_daily: Remaining submissions today
             - wait_minutes: Minutes to wait if rate limited
         """
-        from skills.anti_fraud.skill import check_user_submission_rate as _check_rate
-
         try:
             result = await _check_rate(wallet_address)
             return result
 
         except Exception as e:
-            logger.error(f"Rate check error: {e}")
+            logger.error("Rate check error: %s", e)
             # Default to allow on error
             return {
                 "allowed": True,
@@ -169,20 +173,84 @@ Validates coordinates are within valid ranges and not at (0, 0) which is in the
             - valid: Whether the location is valid
             - reason: Explanation
         """
-        from skills.anti_fraud.skill import check_location_validity as _check_location
-
         try:
             result = await _check_location(latitude, longitude)
             return result
 
         except Exception as e:
-            logger.error(f"Location check error: {e}")
+            logger.error("Location check error: %s", e)
             return {
                 "valid": False,
                 "reason": f"Check failed: {str(e)}"
             }
 
 
+class AntiFraudCombinedCheckTool(BaseTool):
+    """Run the fraud, rate and location checks concurrently."""
+
+    name: str = "anti_fraud_combined_check"
+    description: str = """Run all anti-fraud checks for a submission in one call.
+Combines anti_fraud_check, anti_fraud_rate_check and anti_fraud_location_check;
+the three checks run concurrently."""
+    parameters: dict = {
+        "type": "object",
+        "properties": {
+            "latitude": {
+                "type": "number",
+                "description": "Latitude coordinate"
+            },
+            "longitude": {
+                "type": "number",
+                "description": "Longitude coordinate"
+            },
+            "facility_type": {
+                "type": "string",
+                "description": "Type of facility (ramp/toilet/elevator/wheelchair)"
+            },
+            "wallet_address": {
+                "type": "string",
+                "description": "User's wallet address"
+            }
+        },
+        "required": ["latitude", "longitude", "facility_type", "wallet_address"]
+    }
+
+    async def execute(
+        self,
+        latitude: float,
+        longitude: float,
+        facility_type: str,
+        wallet_address: str,
+        **kwargs: Any
+    ) -> dict:
+        """
+        Run the fraud, rate and location checks concurrently.
+
+        Args:
+            latitude: Latitude coordinate
+            longitude: Longitude coordinate
+            facility_type: Type of facility (ramp/toilet/elevator/wheelchair)
+            wallet_address: User's wallet address
+
+        Returns:
+            dict with:
+            - fraud: Result of anti_fraud_check
+            - rate: Result of anti_fraud_rate_check
+            - location: Result of anti_fraud_location_check
+        """
+        # Each tool handles its own errors and returns a fallback dict
+        fraud, rate, location = await asyncio.gather(
+            AntiFraudCheckTool().execute(latitude, longitude, facility_type),
+            AntiFraudRateCheckTool().execute(wallet_address),
+            AntiFraudLocationCheckTool().execute(latitude, longitude)
+        )
+        return {
+            "fraud": fraud,
+            "rate": rate,
+            "location": location
+        }
+
+
 class AntiFraudStatisticsTool(BaseTool):
     """Get fraud detection statistics."""
 
@@ -218,14 +286,12 @@ Returns total submissions, new facilities count, updates count, and unique contr
             - updates: Number of facility updates
             - unique_contributors: Number of unique contributors (if not filtered by wallet)
         """
-        from skills.anti_fraud.skill import get_fraud_statistics as _get_stats
-
         try:
             result = await _get_stats(wallet_address)
             return result
 
         except Exception as e:
-            logger.error(f"Error getting fraud statistics: {e}")
+            logger.error("Error getting fraud statistics: %s", e)
             return {
                 "error": str(e)
             }
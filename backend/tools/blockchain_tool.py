@@ -9,6 +9,16 @@ from typing import Any
 
 from spoon_ai.tools import BaseTool
 
+from skills.blockchain.skill import (
+    generate_location_hash,
+    distribute_reward_with_hash,
+    send_reward,
+    queue_distribute_reward,
+    get_balance as _get_balance,
+    check_verification as _check_verification,
+    TransactionMaybeSent
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -72,12 +82,6 @@ via RewardDistributor contract, falls back to direct minting if distributor fail
             - amount: Amount of tokens sent
             - error: Error message if failed
         """
-        from skills.blockchain.skill import (
-            generate_location_hash,
-            distribute_reward_with_hash,
-            send_reward
-        )
-
         try:
             # Generate location hash for on-chain verification
             location_hash = generate_location_hash(lat, lng, facility_type)
@@ -85,19 +89,30 @@ via RewardDistributor contract, falls back to direct minting if distributor fail
             # Try distributor first
             try:
                 tx_hash = await distribute_reward_with_hash(wallet, location_hash, amount)
-                logger.info(f"Reward distributed via distributor: {amount} tokens to {wallet}")
+                logger.info("Reward distributed via distributor: %s tokens to %s", amount, wallet)
                 return {
                     "success": True,
                     "tx_hash": tx_hash,
                     "amount": amount,
                     "method": "distributor"
                 }
+            except TransactionMaybeSent as pending_error:
+                # The distributor transaction may have been sent and mined;
+                # minting directly as well could reward the user twice
+                logger.warning("Distributor transaction not mined yet, skipping fallback: %s", pending_error)
+                return {
+                    "success": False,
+                    "tx_hash": None,
+                    "amount": amount,
+                    "pending": True,
+                    "error": str(pending_error)
+                }
             except Exception as distributor_error:
-                logger.warning(f"Distributor failed, falling back to direct mint: {distributor_error}")
+                logger.warning("Distributor failed, falling back to direct mint: %s", distributor_error)
 
                 # Fallback to direct mint
                 tx_hash = await send_reward(wallet, amount)
-                logger.info(f"Reward sent via direct mint: {amount} tokens to {wallet}")
+                logger.info("Reward sent via direct mint: %s tokens to %s", amount, wallet)
                 return {
                     "success": True,
                     "tx_hash": tx_hash,
@@ -107,7 +122,114 @@ via RewardDistributor contract, falls back to direct minting if distributor fail
                 }
 
         except Exception as e:
-            logger.error(f"Blockchain reward error: {e}")
+            logger.error("Blockchain reward error: %s", e)
+            return {
+                "success": False,
+                "tx_hash": None,
+                "amount": amount,
+                "error": str(e)
+            }
+
+
+class BlockchainBatchRewardTool(BaseTool):
+    """Distribute token reward to user, batched with concurrent rewards."""
+
+    name: str = "blockchain_batch_reward"
+    description: str = """Distribute H2E token reward via RewardDistributor contract, batched.
+Rewards requested within a short window are sent together in one
+distributeRewardBatch transaction. If the batch fails, each reward is sent on its own,
+and falls back to direct minting if the distributor fails."""
+    parameters: dict = {
+        "type": "object",
+        "properties": {
+            "wallet": {
+                "type": "string",
+                "description": "User's wallet address (0x...)"
+            },
+            "lat": {
+                "type": "number",
+                "description": "Latitude coordinate"
+            },
+            "lng": {
+                "type": "number",
+                "description": "Longitude coordinate"
+            },
+            "facility_type": {
+                "type": "string",
+                "description": "Type of facility (ramp/toilet/elevator/wheelchair)"
+            },
+            "amount": {
+                "type": "integer",
+                "description": "Reward amount in tokens (default 50)"
+            }
+        },
+        "required": ["wallet", "lat", "lng", "facility_type"]
+    }
+
+    async def execute(
+        self,
+        wallet: str,
+        lat: float,
+        lng: float,
+        facility_type: str,
+        amount: int = 50,
+        **kwargs: Any
+    ) -> dict:
+        """
+        Distribute H2E token reward through the batching queue.
+
+        Args:
+            wallet: User's wallet address (0x...)
+            lat: Latitude coordinate
+            lng: Longitude coordinate
+            facility_type: Type of facility (ramp/toilet/elevator/wheelchair)
+            amount: Reward amount in tokens (default 50)
+
+        Returns:
+            dict with:
+            - success: Whether the reward was sent
+            - tx_hash: Hash of the transaction that carried the reward
+            - amount: Amount of tokens sent
+            - error: Error message if failed
+        """
+        try:
+            location_hash = generate_location_hash(lat, lng, facility_type)
+
+            try:
+                tx_hash = await queue_distribute_reward(wallet, location_hash, amount)
+                logger.info("Reward distributed via distributor batch: %s tokens to %s", amount, wallet)
+                return {
+                    "success": True,
+                    "tx_hash": tx_hash,
+                    "amount": amount,
+                    "method": "distributor_batch"
+                }
+            except TransactionMaybeSent as pending_error:
+                # The distributor transaction may have been sent and mined;
+                # minting directly as well could reward the user twice
+                logger.warning("Distributor transaction not mined yet, skipping fallback: %s", pending_error)
+                return {
+                    "success": False,
+                    "tx_hash": None,
+                    "amount": amount,
+                    "pending": True,
+                    "error": str(pending_error)
+                }
+            except Exception as distributor_error:
+                logger.warning("Distributor failed, falling back to direct mint: %s", distributor_error)
+
+                tx_hash = await send_reward(wallet, amount)
+                logger.info("Reward sent via direct mint: %s tokens to %s", amount, wallet)
+                return {
+                    "success": True,
+                    "tx_hash": tx_hash,
+                    "amount": amount,
+                    "method": "direct_mint",
+                    "distributor_error": str(distributor_error)
+                }
+
+        except Exception as e:
+            logger.error("Blockchain reward error: %s", e)
             return {
                 "success": False,
                 "tx_hash": None,
@@ -144,8 +266,6 @@ class BlockchainBalanceTool(BaseTool):
             - balance: Token balance in whole tokens
             - wallet: The wallet address checked
         """
-        from skills.blockchain.skill import get_balance as _get_balance
-
         try:
             balance = await _get_balance(wallet)
             return {
@@ -153,7 +273,7 @@ class BlockchainBalanceTool(BaseTool):
                 "wallet": wallet
             }
         except Exception as e:
-            logger.error(f"Error getting balance: {e}")
+            logger.error("Error getting balance: %s", e)
             return {
                 "balance": 0,
                 "wallet": wallet,
@@ -206,11 +326,6 @@ Uses the location hash to query the contract."""
             - is_verified: Whether the location is already verified
             - location_hash: The hash that was checked
         """
-        from skills.blockchain.skill import (
-            generate_location_hash,
-            check_verification as _check_verification
-        )
-
         try:
             location_hash = generate_location_hash(lat, lng, facility_type)
             is_verified = await _check_verification(location_hash)
@@ -220,7 +335,7 @@ Uses the location hash to query the contract."""
                 "location_hash": location_hash.hex()
             }
         except Exception as e:
-            logger.error(f"Error checking verification: {e}")
+            logger.error("Error checking verification: %s", e)
             return {
                 "is_verified": False,
                 "error": str(e)
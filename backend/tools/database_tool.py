@@ -5,10 +5,22 @@ SpoonOS tool using BaseTool class for the database skill.
 """
 
 import logging
-from typing import Any, Optional
+from typing import Any, List, Optional
 
 from spoon_ai.tools import BaseTool
 
+from skills.database.skill import (
+    save_facility as _save_facility,
+    save_facilities_bulk as _save_facilities_bulk,
+    update_facility as _update_facility,
+    query_facilities_nearby,
+    save_reward as _save_reward,
+    queue_reward_record as _queue_reward_record,
+    get_user_rewards as _get_user_rewards,
+    get_facility_by_id as _get_facility_by_id,
+    check_existing as _check_existing
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -75,8 +87,6 @@ Records facility type, coordinates, image URL, contributor address, and AI analy
             - success: Whether the save was successful
             - facility_id: UUID of the created facility
         """
-        from skills.database.skill import save_facility as _save_facility
-
         try:
             data = {
                 "type": facility_type,
@@ -88,7 +98,7 @@ Records facility type, coordinates, image URL, contributor address, and AI analy
             }
 
             facility_id = await _save_facility(data)
-            logger.info(f"Saved facility: {facility_id}")
+            logger.info("Saved facility: %s", facility_id)
 
             return {
                 "success": True,
@@ -96,7 +106,7 @@ Records facility type, coordinates, image URL, contributor address, and AI analy
             }
 
         except Exception as e:
-            logger.error(f"Error saving facility: {e}")
+            logger.error("Error saving facility: %s", e)
             return {
                 "success": False,
                 "facility_id": None,
@@ -104,6 +114,100 @@ Records facility type, coordinates, image URL, contributor address, and AI analy
             }
 
 
+class DatabaseSaveFacilitiesBulkTool(BaseTool):
+    """Save many accessibility facilities to the database at once."""
+
+    name: str = "database_save_facilities_bulk"
+    description: str = """Save many facilities to the database in one transaction.
+Use for imports; rows are loaded with COPY instead of one insert per facility."""
+    parameters: dict = {
+        "type": "object",
+        "properties": {
+            "facilities": {
+                "type": "array",
+                "description": "Facilities to save",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "facility_type": {
+                            "type": "string",
+                            "description": "Type of facility (ramp/toilet/elevator/wheelchair)"
+                        },
+                        "latitude": {
+                            "type": "number",
+                            "description": "Latitude coordinate"
+                        },
+                        "longitude": {
+                            "type": "number",
+                            "description": "Longitude coordinate"
+                        },
+                        "image_url": {
+                            "type": "string",
+                            "description": "URL of the uploaded image"
+                        },
+                        "contributor_address": {
+                            "type": "string",
+                            "description": "Wallet address of the contributor"
+                        },
+                        "ai_analysis": {
+                            "type": "string",
+                            "description": "JSON string of AI analysis results (optional)"
+                        }
+                    },
+                    "required": [
+                        "facility_type", "latitude", "longitude", "image_url", "contributor_address"
+                    ]
+                }
+            }
+        },
+        "required": ["facilities"]
+    }
+
+    async def execute(self, facilities: List[dict], **kwargs: Any) -> dict:
+        """
+        Save many facilities to the database in one transaction.
+
+        Args:
+            facilities: List of dicts with the save_facility parameters
+
+        Returns:
+            dict with:
+            - success: Whether the save was successful
+            - facility_ids: UUIDs of the created facilities, in input order
+            - count: Number of facilities saved
+        """
+        try:
+            rows = [
+                {
+                    "type": f["facility_type"],
+                    "latitude": f["latitude"],
+                    "longitude": f["longitude"],
+                    "image_url": f["image_url"],
+                    "contributor_address": f["contributor_address"],
+                    "ai_analysis": f.get("ai_analysis") or "{}"
+                }
+                for f in facilities
+            ]
+
+            facility_ids = await _save_facilities_bulk(rows)
+            logger.info("Saved %d facilities", len(facility_ids))
+
+            return {
+                "success": True,
+                "facility_ids": facility_ids,
+                "count": len(facility_ids)
+            }
+
+        except Exception as e:
+            logger.error("Error saving facilities: %s", e)
+            return {
+                "success": False,
+                "facility_ids": [],
+                "count": 0,
+                "error": str(e)
+            }
+
+
 class DatabaseUpdateFacilityTool(BaseTool):
     """Update an existing facility record."""
 
@@ -149,8 +253,6 @@ Can update image URL and/or AI analysis."""
             - success: Whether the update was successful
             - facility_id: UUID of the updated facility
         """
-        from skills.database.skill import update_facility as _update_facility
-
         try:
             data = {}
             if image_url:
@@ -166,7 +268,7 @@ Can update image URL and/or AI analysis."""
             }
 
         except Exception as e:
-            logger.error(f"Error updating facility: {e}")
+            logger.error("Error updating facility: %s", e)
             return {
                 "success": False,
                 "facility_id": facility_id,
@@ -198,6 +300,10 @@ Uses PostGIS for geospatial queries."""
             "facility_type": {
                 "type": "string",
                 "description": "Optional filter by type (ramp/toilet/elevator/wheelchair)"
+            },
+            "limit": {
+                "type": "integer",
+                "description": "Maximum number of facilities, nearest first (default 100)"
             }
         },
         "required": ["latitude", "longitude"]
@@ -209,6 +315,7 @@ Uses PostGIS for geospatial queries."""
         longitude: float,
         radius: int = 200,
         facility_type: Optional[str] = None,
+        limit: int = 100,
         **kwargs: Any
     ) -> dict:
         """
@@ -219,20 +326,20 @@ Uses PostGIS for geospatial queries."""
             longitude: Center longitude
             radius: Search radius in meters (default 200)
             facility_type: Optional filter by type (ramp/toilet/elevator/wheelchair)
+            limit: Maximum number of facilities, nearest first (default 100)
 
         Returns:
             dict with:
             - facilities: List of nearby facilities
             - count: Number of facilities found
         """
-        from skills.database.skill import query_facilities_nearby
-
         try:
             facilities = await query_facilities_nearby(
                 lat=latitude,
                 lng=longitude,
                 radius=radius,
-                facility_type=facility_type
+                facility_type=facility_type,
+                limit=limit
             )
 
             return {
@@ -241,7 +348,7 @@ Uses PostGIS for geospatial queries."""
             }
 
         except Exception as e:
-            logger.error(f"Error querying facilities: {e}")
+            logger.error("Error querying facilities: %s", e)
             return {
                 "facilities": [],
                 "count": 0,
@@ -298,10 +405,9 @@ Records wallet address, facility ID, token amount, and transaction hash."""
         Returns:
             dict with:
             - success: Whether the save was successful
-            - reward_id: UUID of the reward record
+            - reward_id: UUID of the reward record (None if queued)
+            - queued: True if the record is written in the background
         """
-        from skills.database.skill import save_reward as _save_reward
-
         try:
             data = {
                 "wallet_address": wallet_address,
@@ -310,16 +416,25 @@ Records wallet address, facility ID, token amount, and transaction hash."""
                 "tx_hash": tx_hash
             }
 
+            # An audit record nobody waits on; written in the next batch
+            if _queue_reward_record(data):
+                return {
+                    "success": True,
+                    "reward_id": None,
+                    "queued": True
+                }
+
             reward_id = await _save_reward(data)
-            logger.info(f"Saved reward: {reward_id}")
+            logger.info("Saved reward: %s", reward_id)
 
             return {
                 "success": True,
-                "reward_id": reward_id
+                "reward_id": reward_id,
+                "queued": False
             }
 
         except Exception as e:
-            logger.error(f"Error saving reward: {e}")
+            logger.error("Error saving reward: %s", e)
             return {
                 "success": False,
                 "reward_id": None,
@@ -357,14 +472,12 @@ Returns reward history, total earned, and contribution count."""
             - total_earned: Total tokens earned
             - contribution_count: Number of contributions
         """
-        from skills.database.skill import get_user_rewards as _get_user_rewards
-
         try:
             result = await _get_user_rewards(wallet_address)
             return result
 
         except Exception as e:
-            logger.error(f"Error getting user rewards: {e}")
+            logger.error("Error getting user rewards: %s", e)
             return {
                 "rewards": [],
                 "total_earned": 0,
@@ -400,8 +513,6 @@ Returns facility details or None if not found."""
         Returns:
             dict with facility data or None if not found
         """
-        from skills.database.skill import get_facility_by_id as _get_facility_by_id
-
         try:
             facility = await _get_facility_by_id(facility_id)
 
@@ -417,7 +528,7 @@ Returns facility details or None if not found."""
                 }
 
         except Exception as e:
-            logger.error(f"Error getting facility: {e}")
+            logger.error("Error getting facility: %s", e)
             return {
                 "found": False,
                 "facility": None,
@@ -472,14 +583,12 @@ Uses PostGIS to find facilities within 50m with the same type."""
             - last_updated: When the facility was last updated
             - days_since_update: Days since last update
         """
-        from skills.database.skill import check_existing as _check_existing
-
         try:
             result = await _check_existing(latitude, longitude, facility_type)
             return result
 
         except Exception as e:
-            logger.error(f"Error checking existing facility: {e}")
+            logger.error("Error checking existing facility: %s", e)
             return {
                 "exists": False,
                 "facility": None,
@@ -0,0 +1,143 @@
+"""
+Pipeline Tool - Save and reward a verified contribution in one step
+
+SpoonOS tool using BaseTool class that chains the database and blockchain tools.
+"""
+
+import asyncio
+import logging
+from typing import Any, Optional
+
+from spoon_ai.tools import BaseTool
+
+from tools.blockchain_tool import BlockchainRewardTool
+from tools.database_tool import (
+    DatabaseSaveFacilityTool,
+    DatabaseSaveRewardTool,
+    DatabaseUpdateFacilityTool
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ContributionPipelineTool(BaseTool):
+    """Save a facility and distribute its reward concurrently, then record the reward."""
+
+    name: str = "contribution_pipeline"
+    description: str = """Save a verified facility and reward the contributor in one call.
+Use after anti_fraud_check has passed. Runs database_save_facility (or database_update_facility
+when anti_fraud_check returned an existing_facility_id) and blockchain_reward concurrently
+(the reward does not depend on the facility ID), then database_save_reward."""
+    parameters: dict = {
+        "type": "object",
+        "properties": {
+            "facility_type": {
+                "type": "string",
+                "description": "Type of facility (ramp/toilet/elevator/wheelchair)"
+            },
+            "latitude": {
+                "type": "number",
+                "description": "Latitude coordinate"
+            },
+            "longitude": {
+                "type": "number",
+                "description": "Longitude coordinate"
+            },
+            "image_url": {
+                "type": "string",
+                "description": "URL of the uploaded image"
+            },
+            "wallet_address": {
+                "type": "string",
+                "description": "Contributor's wallet address (0x...)"
+            },
+            "amount": {
+                "type": "integer",
+                "description": "Reward amount in tokens (default 50)"
+            },
+            "ai_analysis": {
+                "type": "string",
+                "description": "JSON string of AI analysis results (optional)"
+            },
+            "existing_facility_id": {
+                "type": "string",
+                "description": "existing_facility_id from anti_fraud_check; updates that facility instead of creating one (optional)"
+            }
+        },
+        "required": ["facility_type", "latitude", "longitude", "image_url", "wallet_address"]
+    }
+
+    async def execute(
+        self,
+        facility_type: str,
+        latitude: float,
+        longitude: float,
+        image_url: str,
+        wallet_address: str,
+        amount: int = 50,
+        ai_analysis: Optional[str] = None,
+        existing_facility_id: Optional[str] = None,
+        **kwargs: Any
+    ) -> dict:
+        """
+        Save a facility and distribute its reward, then record the reward.
+
+        Args:
+            facility_type: Type of facility (ramp/toilet/elevator/wheelchair)
+            latitude: Latitude coordinate
+            longitude: Longitude coordinate
+            image_url: URL of the uploaded image
+            wallet_address: Contributor's wallet address (0x...)
+            amount: Reward amount in tokens (default 50)
+            ai_analysis: JSON string of AI analysis results (optional)
+            existing_facility_id: Facility to update for an "update" verdict (optional)
+
+        Returns:
+            dict with:
+            - success: Whether the facility was saved and the reward sent
+            - facility_id: UUID of the created or updated facility
+            - tx_hash: Transaction hash on blockchain
+            - amount: Amount of tokens sent
+            - queued: True if the reward record is written in the background
+            - error: Error message if a step failed
+        """
+        if existing_facility_id:
+            # An "update" verdict refreshes the facility instead of adding a row
+            save = DatabaseUpdateFacilityTool().execute(
+                existing_facility_id, image_url, ai_analysis
+            )
+        else:
+            save = DatabaseSaveFacilityTool().execute(
+                facility_type, latitude, longitude, image_url, wallet_address, ai_analysis
+            )
+
+        # Each tool handles its own errors and reports them in its result
+        facility, reward = await asyncio.gather(
+            save,
+            BlockchainRewardTool().execute(
+                wallet_address, latitude, longitude, facility_type, amount
+            )
+        )
+
+        reward_record = {"success": False, "queued": False}
+        if reward.get("success"):
+            # Recorded even if the facility save failed (facility_id is
+            # nullable), so every on-chain reward has a row
+            reward_record = await DatabaseSaveRewardTool().execute(
+                wallet_address, facility.get("facility_id"), amount, reward.get("tx_hash")
+            )
+
+        result = {
+            "success": bool(facility.get("success") and reward.get("success")),
+            "facility_id": facility.get("facility_id"),
+            "tx_hash": reward.get("tx_hash"),
+            "amount": amount,
+            "queued": bool(reward_record.get("queued"))
+        }
+        errors = [r["error"] for r in (facility, reward, reward_record) if r.get("error")]
+        if errors:
+            result["error"] = "; ".join(errors)
+        logger.info(
+            "Contribution pipeline: facility=%s, tx=%s", result["facility_id"], result["tx_hash"]
+        )
+        return result
@@ -6,10 +6,15 @@ SpoonOS tool using BaseTool class for the vision skill.
 
 import base64
 import logging
-from typing import Any
+from typing import Any, Union
 
 from spoon_ai.tools import BaseTool
 
+from skills.vision.skill import (
+    analyze_image as _analyze_image,
+    validate_image_quality as _validate
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,12 +37,13 @@ and extract relevant details."""
         "required": ["image_base64"]
     }
 
-    async def execute(self, image_base64: str, **kwargs: Any) -> dict:
+    async def execute(self, image_base64: Union[str, bytes], **kwargs: Any) -> dict:
         """
         Analyze an uploaded image to identify accessibility facilities.
 
         Args:
-            image_base64: Base64 encoded image data, or "USE_CONTEXT" to retrieve from upload context
+            image_base64: Base64 encoded image data, raw image bytes (in-process
+                callers), or "USE_CONTEXT" to retrieve from upload context
 
         Returns:
             dict with analysis results including:
@@ -47,11 +53,12 @@ and extract relevant details."""
             - confidence: Confidence score (0-1)
             - details: Additional extracted information
         """
-        from skills.vision.skill import analyze_image as _analyze_image
-
         try:
             # Check if we should retrieve image from context
-            if image_base64 == "USE_CONTEXT" or image_base64.startswith("USE_CONTEXT"):
+            if isinstance(image_base64, (bytes, bytearray, memoryview)):
+                # In-process callers can pass the raw image directly
+                image_bytes = bytes(image_base64)
+            elif image_base64 == "USE_CONTEXT" or image_base64.startswith("USE_CONTEXT"):
                 from agent.spoon_agent import _current_upload_context
                 if not _current_upload_context or "image_bytes" not in _current_upload_context:
                     return {
@@ -62,7 +69,7 @@ and extract relevant details."""
                         "details": None
                     }
                 image_bytes = _current_upload_context["image_bytes"]
-                logger.info(f"Retrieved image from context: {len(image_bytes)} bytes")
+                logger.info("Retrieved image from context: %s bytes", len(image_bytes))
             else:
                 # Decode base64 to bytes
                 image_bytes = base64.b64decode(image_base64)
@@ -70,11 +77,11 @@ and extract relevant details."""
             # Call the existing skill implementation
             result = await _analyze_image(image_bytes)
 
-            logger.info(f"Vision analysis complete: valid={result.get('is_valid')}, type={result.get('facility_type')}")
+            logger.info("Vision analysis complete: valid=%s, type=%s", result.get('is_valid'), result.get('facility_type'))
             return result
 
         except Exception as e:
-            logger.error(f"Vision tool error: {e}")
+            logger.error("Vision tool error: %s", e)
             return {
                 "is_valid": False,
                 "facility_type": None,
@@ -101,21 +108,23 @@ Checks if image is not too small (min 200x200) and not too large (max 10MB)."""
         "required": ["image_base64"]
     }
 
-    async def execute(self, image_base64: str, **kwargs: Any) -> dict:
+    async def execute(self, image_base64: Union[str, bytes], **kwargs: Any) -> dict:
         """
         Validate image quality before analysis.
 
         Args:
-            image_base64: Base64 encoded image data, or "USE_CONTEXT" to retrieve from upload context
+            image_base64: Base64 encoded image data, raw image bytes (in-process
+                callers), or "USE_CONTEXT" to retrieve from upload context
 
         Returns:
             dict with quality assessment
         """
-        from skills.vision.skill import validate_image_quality as _validate
-
         try:
             # Check if we should retrieve image from context
-            if image_base64 == "USE_CONTEXT" or image_base64.startswith("USE_CONTEXT"):
+            if isinstance(image_base64, (bytes, bytearray, memoryview)):
+                # In-process callers can pass the raw image directly
+                image_bytes = bytes(image_base64)
+            elif image_base64 == "USE_CONTEXT" or image_base64.startswith("USE_CONTEXT"):
                 from agent.spoon_agent import _current_upload_context
                 if not _current_upload_context or "image_bytes" not in _current_upload_context:
                     return {
@@ -127,7 +136,7 @@ Checks if image is not too small (min 200x200) and not too large (max 10MB)."""
                 image_bytes = base64.b64decode(image_base64)
             return await _validate(image_bytes)
         except Exception as e:
-            logger.error(f"Image quality validation error: {e}")
+            logger.error("Image quality validation error: %s", e)
             return {
                 "is_acceptable": False,
                 "reason": f"Failed to validate image: {str(e)}"
@@ -74,6 +74,27 @@ contract Help2EarnToken is ERC20, Ownable {
         emit TokensMinted(to, amount, reason);
     }
 
+    /**
+     * @dev Mint tokens to several recipients in one transaction
+     * @param to Recipient addresses
+     * @param amounts Amounts of tokens to mint (in wei), matched to `to` by index
+     */
+    function batchMint(address[] calldata to, uint256[] calldata amounts) external onlyMinter {
+        require(to.length == amounts.length, "Help2EarnToken: length mismatch");
+
+        uint256 total;
+        for (uint256 i = 0; i < amounts.length; i++) {
+            total += amounts[i];
+        }
+        require(totalSupply() + total <= MAX_SUPPLY, "Help2EarnToken: max supply exceeded");
+
+        for (uint256 i = 0; i < to.length; i++) {
+            require(to[i] != address(0), "Help2EarnToken: mint to zero address");
+            _mint(to[i], amounts[i]);
+            emit TokensMinted(to[i], amounts[i], "facility_verification");
+        }
+    }
+
     /**
      * @dev Burn tokens from caller's balance
      * @param amount Amount of tokens to burn
@@ -156,6 +156,48 @@ contract RewardDistributor is Ownable, ReentrancyGuard {
         emit RewardDistributed(user, locationHash, amount, block.timestamp, facilityType);
     }
 
+    /**
+     * @dev Distribute rewards for many verified facilities in one transaction
+     * @param users Users' wallet addresses
+     * @param locationHashes Unique hashes of the facility locations
+     * @param amounts Reward amounts (each must match a configured amount)
+     *
+     * Reverts as a whole if any entry is invalid or already verified.
+     */
+    function distributeRewardBatch(
+        address[] calldata users,
+        bytes32[] calldata locationHashes,
+        uint256[] calldata amounts
+    ) external onlyAuthorized nonReentrant {
+        require(
+            users.length == locationHashes.length && users.length == amounts.length,
+            "RewardDistributor: length mismatch"
+        );
+
+        uint256 total;
+        for (uint256 i = 0; i < users.length; i++) {
+            require(users[i] != address(0), "RewardDistributor: user is zero address");
+            require(!verificationRecords[locationHashes[i]], "RewardDistributor: already verified");
+            require(
+                amounts[i] == newFacilityReward || amounts[i] == updateFacilityReward,
+                "RewardDistributor: invalid reward amount"
+            );
+
+            // Mark as verified (also rejects a hash repeated within the batch)
+            verificationRecords[locationHashes[i]] = true;
+            total += amounts[i];
+
+            // Mint tokens to user
+            token.mint(users[i], amounts[i]);
+
+            emit RewardDistributed(users[i], locationHashes[i], amounts[i], block.timestamp, "");
+        }
+
+        // Update statistics
+        totalDistributed += total;
+        totalVerifications += users.length;
+    }
+
     /**
      * @dev Check if a location has been verified
      * @param locationHash Hash of the location
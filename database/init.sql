@@ -1,5 +1,7 @@
 -- Help2Earn Database Initialization Script
 -- PostgreSQL with PostGIS extension
+--
+-- After this script, apply database/migrations/*.sql in numeric order.
 
 -- Enable PostGIS extension for geographic queries
 CREATE EXTENSION IF NOT EXISTS postgis;
@@ -0,0 +1,41 @@
+-- Migration 001: server-side fraud decision
+-- Used by the anti-fraud skill so a duplicate check is a single round-trip.
+-- Defaults mirror the constants in backend/skills/anti_fraud/skill.py.
+
+CREATE OR REPLACE FUNCTION check_fraud(
+    p_lat DOUBLE PRECISION,
+    p_lng DOUBLE PRECISION,
+    p_type TEXT,
+    p_radius_m DOUBLE PRECISION DEFAULT 50,
+    p_window_days INTEGER DEFAULT 15,
+    p_new_reward INTEGER DEFAULT 50,
+    p_update_reward INTEGER DEFAULT 25
+)
+RETURNS TABLE (
+    is_fraud BOOLEAN,
+    reward_amount INTEGER,
+    reason TEXT,
+    existing_facility_id UUID
+) AS $$
+DECLARE
+    v_point GEOGRAPHY := ST_SetSRID(ST_MakePoint(p_lng, p_lat), 4326)::geography;
+    v_id UUID;
+    v_days INTEGER;
+BEGIN
+    SELECT f.id, EXTRACT(DAY FROM NOW() - f.updated_at)::INTEGER
+    INTO v_id, v_days
+    FROM facilities f
+    WHERE f.type = p_type
+    AND ST_DWithin(f.location, v_point, p_radius_m)
+    ORDER BY ST_Distance(f.location, v_point) ASC
+    LIMIT 1;
+
+    IF v_id IS NULL THEN
+        RETURN QUERY SELECT FALSE, p_new_reward, 'new_facility'::TEXT, NULL::UUID;
+    ELSIF COALESCE(v_days, 0) < p_window_days THEN
+        RETURN QUERY SELECT TRUE, 0, format('duplicate_within_%s_days', p_window_days), v_id;
+    ELSE
+        RETURN QUERY SELECT FALSE, p_update_reward, 'facility_update'::TEXT, v_id;
+    END IF;
+END;
+$$ LANGUAGE plpgsql STABLE;
@@ -0,0 +1,8 @@
+-- Migration 002: physically order facilities by location
+-- Nearby facilities end up on the same heap pages, so the duplicate check and
+-- radius queries touch a handful of pages instead of one page per match.
+-- CLUSTER takes an ACCESS EXCLUSIVE lock; run during a quiet period and
+-- re-run occasionally as the table grows (new rows are appended unordered).
+
+CLUSTER facilities USING idx_facilities_location;
+ANALYZE facilities;
@@ -0,0 +1,14 @@
+-- Migration 004: composite (type, location) GiST index
+-- check_existing, check_fraud() and the typed nearby query all filter on
+-- type = $n AND ST_DWithin(location, ...). ST_DWithin (unlike a bare
+-- ST_Distance comparison) expands to a bounding-box && test the index can
+-- answer, and with btree_gist the type equality is checked in the same
+-- index scan instead of as a heap filter afterwards.
+-- CONCURRENTLY avoids blocking writes; run outside a transaction block.
+
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_facilities_type_location
+ON facilities USING GIST (type, location);
+
+ANALYZE facilities;
@@ -0,0 +1,10 @@
+-- Migration 005: store latitude/longitude as generated columns
+-- Every facility SELECT used to compute ST_X/ST_Y(location::geometry) per
+-- row; the values are now derived once on write and read back directly.
+-- Adding a STORED column rewrites the table; run during a quiet period.
+
+ALTER TABLE facilities
+    ADD COLUMN IF NOT EXISTS longitude DOUBLE PRECISION
+        GENERATED ALWAYS AS (ST_X(location::geometry)) STORED,
+    ADD COLUMN IF NOT EXISTS latitude DOUBLE PRECISION
+        GENERATED ALWAYS AS (ST_Y(location::geometry)) STORED;
@@ -0,0 +1,18 @@
+-- Migration 006: store ai_analysis as JSONB
+-- The backend now exchanges ai_analysis as Python objects through an asyncpg
+-- jsonb codec instead of re-serialising JSON text on every read and write.
+-- Legacy rows that are not valid JSON are kept as JSON strings.
+-- Changing the column type rewrites the table; run during a quiet period.
+
+CREATE FUNCTION pg_temp.to_jsonb_lenient(p_text TEXT)
+RETURNS JSONB AS $$
+BEGIN
+    RETURN p_text::jsonb;
+EXCEPTION WHEN invalid_text_representation THEN
+    RETURN to_jsonb(p_text);
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+ALTER TABLE facilities
+    ALTER COLUMN ai_analysis TYPE JSONB
+    USING pg_temp.to_jsonb_lenient(ai_analysis);
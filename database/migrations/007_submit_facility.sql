@@ -0,0 +1,68 @@
+-- Migration 007: rate check, duplicate check and save in one call
+-- The upload path used to run check_fraud() plus the submission counts in
+-- one query and then INSERT or UPDATE the facility in a second one. This
+-- function does all of it server-side, so a submission costs one round trip.
+-- Nothing is written when the wallet is over its limits or the submission
+-- is a duplicate; facility_id is NULL in that case.
+
+CREATE OR REPLACE FUNCTION submit_facility(
+    p_lat DOUBLE PRECISION,
+    p_lng DOUBLE PRECISION,
+    p_type TEXT,
+    p_image_url TEXT,
+    p_ai_analysis JSONB,
+    p_contributor TEXT,
+    p_max_hourly INTEGER,
+    p_max_daily INTEGER,
+    p_radius_m DOUBLE PRECISION DEFAULT 50,
+    p_window_days INTEGER DEFAULT 15,
+    p_new_reward INTEGER DEFAULT 50,
+    p_update_reward INTEGER DEFAULT 25
+)
+RETURNS TABLE (
+    hourly_count BIGINT,
+    daily_count BIGINT,
+    is_fraud BOOLEAN,
+    reward_amount INTEGER,
+    reason TEXT,
+    existing_facility_id UUID,
+    facility_id UUID
+) AS $$
+DECLARE
+    v_hourly BIGINT;
+    v_daily BIGINT;
+    v_check RECORD;
+    v_id UUID;
+BEGIN
+    SELECT
+        COUNT(*) FILTER (WHERE f.created_at > NOW() - INTERVAL '1 hour'),
+        COUNT(*) FILTER (WHERE f.created_at > NOW() - INTERVAL '1 day')
+    INTO v_hourly, v_daily
+    FROM facilities f
+    WHERE f.contributor_address = p_contributor;
+
+    SELECT * INTO v_check
+    FROM check_fraud(p_lat, p_lng, p_type, p_radius_m, p_window_days, p_new_reward, p_update_reward);
+
+    IF v_hourly < p_max_hourly AND v_daily < p_max_daily AND NOT v_check.is_fraud THEN
+        IF v_check.existing_facility_id IS NULL THEN
+            INSERT INTO facilities (type, location, image_url, ai_analysis, contributor_address)
+            VALUES (
+                p_type,
+                ST_SetSRID(ST_MakePoint(p_lng, p_lat), 4326)::geography,
+                p_image_url, p_ai_analysis, p_contributor
+            )
+            RETURNING id INTO v_id;
+        ELSE
+            UPDATE facilities f
+            SET image_url = p_image_url, ai_analysis = p_ai_analysis, updated_at = NOW()
+            WHERE f.id = v_check.existing_facility_id;
+            v_id := v_check.existing_facility_id;
+        END IF;
+    END IF;
+
+    RETURN QUERY SELECT
+        v_hourly, v_daily, v_check.is_fraud, v_check.reward_amount,
+        v_check.reason, v_check.existing_facility_id, v_id;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,8 @@
+-- Migration 008: generate ids with the built-in gen_random_uuid()
+-- Inserts already take their ids from the column default and hand them back
+-- with RETURNING id. gen_random_uuid() is built into PostgreSQL 13+ and
+-- avoids the uuid-ossp extension call of uuid_generate_v4().
+
+ALTER TABLE facilities ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE rewards ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE verification_logs ALTER COLUMN id SET DEFAULT gen_random_uuid();
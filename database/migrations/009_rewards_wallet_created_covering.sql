@@ -0,0 +1,15 @@
+-- Migration 009: covering (wallet_address, created_at DESC) index on rewards
+-- get_user_rewards filters on wallet_address and orders by created_at DESC.
+-- This index returns a wallet's rewards already in that order, and with the
+-- remaining selected columns INCLUDEd it can answer from an index-only scan
+-- (autovacuum keeps the visibility map current). It supersedes the plain
+-- wallet_address index, which is a prefix of it.
+-- CONCURRENTLY avoids blocking writes; run outside a transaction block.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rewards_wallet_created
+ON rewards (wallet_address, created_at DESC)
+INCLUDE (id, facility_id, amount, tx_hash);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_rewards_wallet;
+
+ANALYZE rewards;
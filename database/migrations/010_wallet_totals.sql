@@ -0,0 +1,37 @@
+-- Migration 010: per-wallet reward totals maintained on insert
+-- get_total_rewards reads one row from wallet_totals instead of summing
+-- every reward of the wallet. Rewards are append-only, so only INSERT is
+-- tracked; a manual DELETE/UPDATE on rewards needs the backfill below re-run.
+
+CREATE TABLE IF NOT EXISTS wallet_totals (
+    wallet_address VARCHAR(42) PRIMARY KEY,
+    total_amount BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE OR REPLACE FUNCTION trg_rewards_wallet_totals()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO wallet_totals (wallet_address, total_amount, updated_at)
+    VALUES (NEW.wallet_address, NEW.amount, NOW())
+    ON CONFLICT (wallet_address) DO UPDATE
+    SET total_amount = wallet_totals.total_amount + EXCLUDED.total_amount,
+        updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS rewards_wallet_totals ON rewards;
+CREATE TRIGGER rewards_wallet_totals
+    AFTER INSERT ON rewards
+    FOR EACH ROW
+    EXECUTE FUNCTION trg_rewards_wallet_totals();
+
+-- Backfill from existing rewards
+INSERT INTO wallet_totals (wallet_address, total_amount, updated_at)
+SELECT wallet_address, SUM(amount), NOW()
+FROM rewards
+GROUP BY wallet_address
+ON CONFLICT (wallet_address) DO UPDATE
+SET total_amount = EXCLUDED.total_amount,
+    updated_at = NOW();
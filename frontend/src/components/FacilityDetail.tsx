@@ -5,10 +5,10 @@ import { X, MapPin, Clock, User } from 'lucide-react';
 import { Facility } from '@/services/api';
 
 // Parse AI analysis JSON
-const parseAiAnalysis = (analysis: string | undefined): { condition?: string; details?: string } => {
+const parseAiAnalysis = (analysis: Facility['ai_analysis']): { condition?: string; details?: string } => {
   if (!analysis) return {};
   try {
-    const parsed = JSON.parse(analysis);
+    const parsed = typeof analysis === 'string' ? JSON.parse(analysis) : analysis;
     // If parsed object has 'condition', use it.
     // If previously saved only details (as dict), handle that legacy case? 
     // New format: { condition: "...", details: {...} }
@@ -28,7 +28,7 @@ const parseAiAnalysis = (analysis: string | undefined): { condition?: string; de
         };
     }
   } catch {
-    return { condition: analysis };
+    return { condition: String(analysis) };
   }
 };
 
@@ -24,7 +24,7 @@ export interface Facility {
   latitude: number;
   longitude: number;
   image_url: string;
-  ai_analysis?: string;
+  ai_analysis?: string | Record<string, unknown>;
   contributor_address: string;
   distance?: number;
   created_at: string;
@@ -18,7 +18,6 @@ def test_upload():
         return
 
     try:
-        files = {'image': ('test_image.jpg', open(IMAGE_PATH, 'rb'), 'image/jpeg')}
         data = {
             'latitude': str(LAT),
             'longitude': str(LNG),
@@ -28,7 +27,10 @@ def test_upload():
         # Increase timeout because agent workflow takes time (Gemini + Blockchain)
         timeout = httpx.Timeout(120.0, connect=10.0)
         
-        with httpx.Client(timeout=timeout) as client:
+        # httpx streams the open file into the multipart body; the with
+        # block closes it even if the request fails
+        with open(IMAGE_PATH, 'rb') as image, httpx.Client(timeout=timeout) as client:
+            files = {'image': ('test_image.jpg', image, 'image/jpeg')}
             response = client.post(API_URL, files=files, data=data)
             
         print(f"Status Code: {response.status_code}")